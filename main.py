@@ -1,4 +1,5 @@
 import argparse
+import os
 import time
 import logging
 import traceback
@@ -30,7 +31,7 @@ from scrapers.games_island import scrape_games_island  # Neuer Import für games
 # Logger-Konfiguration
 logger = logging.getLogger("main")
 logging.basicConfig(
-    level=logging.INFO,
+    level=os.environ.get("LOGLEVEL", "INFO").upper(),  # z.B. LOGLEVEL=DEBUG für ausführliche Ausgabe
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
     handlers=[
         logging.StreamHandler(),  # Konsolenausgabe
@@ -13,12 +13,14 @@ import re
 import random
 import time
 import json
+import hashlib
 import warnings
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin, quote_plus
 from utils.matcher import is_keyword_in_text, extract_product_type_from_text
 from utils.stock import update_product_status
 from utils.availability import detect_availability
+from utils.requests_handler import HTML_PARSER
 from requests.packages.urllib3.exceptions import InsecureRequestWarning
 
 # Unterdrücke InsecureRequestWarning
@@ -477,7 +479,7 @@ def fetch_products_from_categories():
                 continue
                 
             # Parsen mit BeautifulSoup
-            soup = BeautifulSoup(response.content, "html.parser")
+            soup = BeautifulSoup(response.content, HTML_PARSER)
             
             # Finde alle Produktlinks in dieser Kategorie
             category_products = extract_product_links_from_category(soup, category_url)
@@ -674,7 +676,7 @@ def get_product_details(url, search_terms, product_info_list):
             # Prüfe auf Erfolg
             if response.status_code == 200:
                 # Parsen mit BeautifulSoup
-                soup = BeautifulSoup(response.content, "html.parser")
+                soup = BeautifulSoup(response.content, HTML_PARSER)
                 
                 # Extrahiere den Titel
                 title = extract_title(soup)
@@ -833,7 +835,6 @@ def url_to_id(url):
     :param url: URL
     :return: Cache-ID
     """
-    import hashlib
     return hashlib.md5(url.encode()).hexdigest()
 
 def create_product_id(title, base_id="gamesisland"):
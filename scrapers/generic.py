@@ -5,6 +5,7 @@ import json
 import time
 import re
 import logging
+from functools import lru_cache
 from pathlib import Path
 from bs4 import BeautifulSoup
 from urllib.parse import urlparse, urljoin
@@ -53,6 +54,18 @@ GLOBAL_URL_FILTERS = [
     # Leere Links oder JavaScript-Links
     "javascript:", "#", "tel:", "mailto:",
 ]
+_RE_GLOBAL_URL_FILTERS = re.compile("|".join(re.escape(term) for term in GLOBAL_URL_FILTERS))
+
+# Einfache Produkttyp-Erkennung für IDs, falls der Matcher keinen Typ liefert (Reihenfolge = Priorität)
+_PRODUCT_TYPE_FALLBACKS = (
+    ("display", re.compile(r'display|36er')),
+    ("etb", re.compile(r'etb|elite trainer box')),
+    ("ttb", re.compile(r'ttb|top trainer box')),
+    ("booster", re.compile(r'booster|pack|sleeve')),
+    ("box", re.compile(r'box|tin')),
+    ("blister", re.compile(r'blister|check\s?lane')),
+)
+_RE_SERIES_CODE = re.compile(r'(?:sv|kp|op)(?:\s|-)?\d+')
 
 # Domainspezifische Filter (für bestimmte Webshops)
 DOMAIN_FILTERS = {
@@ -186,9 +199,8 @@ def should_filter_url(url, link_text=""):
     domain = get_domain(url)
     
     # 1. Prüfe globale URL-Filter
-    for filter_term in GLOBAL_URL_FILTERS:
-        if filter_term in normalized_url:
-            return True
+    if _RE_GLOBAL_URL_FILTERS.search(normalized_url):
+        return True
             
     # 2. Prüfe domainspezifische Filter
     for site, filters in DOMAIN_FILTERS.items():
@@ -230,6 +242,9 @@ def scrape_generic(url, keywords_map, seen, out_of_stock, check_availability=Tru
     cached_keywords = product_cache.get(cache_key, [])
     current_keywords = list(keywords_map.keys())
     
+    # Produkttyp je Suchbegriff nur einmal pro Durchlauf bestimmen statt für jeden Link erneut
+    search_term_types = {search_term: extract_product_type_from_search_term(search_term) for search_term in keywords_map}
+    
     new_keywords = [k for k in current_keywords if k not in cached_keywords]
     if new_keywords:
         logger.info(f"🔍 Neue Suchbegriffe gefunden: {new_keywords}")
@@ -249,9 +264,6 @@ def scrape_generic(url, keywords_map, seen, out_of_stock, check_availability=Tru
         search_product_type = extract_product_type_from_text(sample_search_term)
         logger.debug(f"🔍 Suche nach Produkttyp: '{search_product_type}' basierend auf '{sample_search_term}'")
     
-    # URL-Hash zur eindeutigen Identifikation von URLs mit dynamischen Parametern
-    url_hash = hashlib.md5(url.encode('utf-8')).hexdigest()[:10]
-    
     # Set für Deduplizierung von gefundenen Produkten innerhalb eines Durchlaufs
     found_product_ids = set()
     
@@ -447,9 +459,6 @@ def scrape_generic(url, keywords_map, seen, out_of_stock, check_availability=Tru
                 logger.warning(f"⚠️ Fehler beim Abrufen von {url}: {error}")
                 return new_matches
             
-            # Titel der Seite extrahieren
-            page_title = soup.title.text.strip() if soup.title else url
-            
             # Alle Links sammeln
             all_links = soup.find_all('a', href=True)
             
@@ -479,8 +488,7 @@ def scrape_generic(url, keywords_map, seen, out_of_stock, check_availability=Tru
                 
                 # Effizientere Keyword-Prüfung
                 for search_term, tokens in keywords_map.items():
-                    # Extrahiere Produkttyp aus dem Suchbegriff
-                    search_term_type = extract_product_type_from_search_term(search_term)
+                    search_term_type = search_term_types[search_term]
                     
                     # Bei spezifischen Produkttypen: zusätzliche Prüfung auf entsprechende Begriffe im Linktext
                     if search_term_type == "display":
@@ -520,10 +528,10 @@ def scrape_generic(url, keywords_map, seen, out_of_stock, check_availability=Tru
                 
                 # Prüfe jeden Suchbegriff gegen den Linktext
                 matched_term = None
+                # Produkttyp des Link-Texts hängt nicht vom Suchbegriff ab
+                link_product_type = extract_product_type_from_text(link_text)
                 for search_term, tokens in keywords_map.items():
-                    # Extrahiere Produkttyp aus dem Suchbegriff und dem Link-Text
-                    search_term_type = extract_product_type_from_search_term(search_term)
-                    link_product_type = extract_product_type_from_text(link_text)
+                    search_term_type = search_term_types[search_term]
                     
                     # Wenn nach einem bestimmten Produkttyp gesucht wird, muss dieser im Link übereinstimmen
                     if search_term_type in ["display", "etb", "ttb"] and link_product_type != search_term_type:
@@ -719,6 +727,7 @@ def create_product_id(product_title, site_id="generic"):
     
     return product_id
 
+@lru_cache(maxsize=1024)  # Für jeden Link wird eine ID erzeugt, Titel wiederholen sich über Suchbegriffe hinweg
 def extract_product_info(title):
     """
     Extrahiert wichtige Produktinformationen aus dem Titel für eine präzise ID-Erstellung
@@ -726,12 +735,14 @@ def extract_product_info(title):
     :param title: Produkttitel
     :return: Tupel mit (series_code, product_type, language)
     """
+    title_lower = title.lower()
+    
     # Extrahiere Sprache (DE/EN/JP)
-    if "(DE)" in title or "pro Person" in title or "deutsch" in title.lower() or "deu" in title.lower():
+    if "(DE)" in title or "pro Person" in title or "deutsch" in title_lower or "deu" in title_lower:
         language = "DE"
-    elif "(EN)" in title or "per person" in title or "english" in title.lower() or "eng" in title.lower():
+    elif "(EN)" in title or "per person" in title or "english" in title_lower or "eng" in title_lower:
         language = "EN"
-    elif "(JP)" in title or "japan" in title.lower() or "jpn" in title.lower():
+    elif "(JP)" in title or "japan" in title_lower or "jpn" in title_lower:
         language = "JP"
     else:
         language = "UNK"
@@ -742,25 +753,15 @@ def extract_product_info(title):
         product_type = detected_type
     else:
         # Fallback zur alten Methode
-        if re.search(r'display|36er', title.lower()):
-            product_type = "display"
-        elif re.search(r'etb|elite trainer box', title.lower()):
-            product_type = "etb"
-        elif re.search(r'ttb|top trainer box', title.lower()):
-            product_type = "ttb"
-        elif re.search(r'booster|pack|sleeve', title.lower()):
-            product_type = "booster"
-        elif re.search(r'box|tin', title.lower()):
-            product_type = "box"
-        elif re.search(r'blister|check\s?lane', title.lower()):
-            product_type = "blister"
-        else:
-            product_type = "unknown"
+        product_type = next(
+            (fallback_type for fallback_type, pattern in _PRODUCT_TYPE_FALLBACKS if pattern.search(title_lower)),
+            "unknown"
+        )
     
     # Extrahiere Serien-/Set-Code
     series_code = "unknown"
     # Suche nach Standard-Codes wie SV09, KP09, etc.
-    code_match = re.search(r'(?:sv|kp|op)(?:\s|-)?\d+', title.lower())
+    code_match = _RE_SERIES_CODE.search(title_lower)
     if code_match:
         series_code = code_match.group(0).replace(" ", "").replace("-", "")
     # Ansonsten versuche, aus dem Titel abzuleiten
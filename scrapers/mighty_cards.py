@@ -7,6 +7,7 @@ Diese kombinierte Lösung bietet hohe Performance und Genauigkeit.
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 import hashlib
 import re
 import json
@@ -19,8 +20,11 @@ import queue
 import concurrent.futures
 from pathlib import Path
 from threading import Lock
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 from urllib.parse import urljoin, quote_plus
+from utils.stock import update_product_status
+from utils.matcher import extract_product_type_from_text, clean_text
+from utils.requests_handler import HTML_PARSER
 
 # Importiere die neuen Module für Selenium-Funktionalität
 import selenium_manager
@@ -52,6 +56,8 @@ PRODUCT_BLACKLIST = [
     "ultimate advent", "battle evolution", "supreme rivalry", "vermilion", "ultimate squad",
     "rise of", "beyond generations", "trial by frost", "beyond the gates"
 ]
+# Alle Blacklist-Begriffe als eine Alternation: ein Durchlauf statt ~130 Teilstring-Tests pro Link
+_RE_BLACKLIST = re.compile("|".join(re.escape(term) for term in PRODUCT_BLACKLIST))
 
 # Produkt-Typ Mapping (verschiedene Schreibweisen für die gleichen Produkttypen)
 PRODUCT_TYPE_VARIANTS = {
@@ -91,6 +97,17 @@ cache_lock = Lock()
 # Cache-Datei
 CACHE_FILE = "data/mighty_cards_cache.json"
 
+# Direkte Suche nur, solange über die Sitemap weniger Produkte gefunden wurden
+MIN_SITEMAP_PRODUCTS = 2
+
+# Auf Suchseiten werden nur Shop-Links ausgewertet, den restlichen Baum nicht aufbauen
+_STRAINER_SHOP_LINKS = SoupStrainer("a", href=re.compile("/shop/"))
+
+# Gemeinsame Session für alle Anfragen an mighty-cards.de: Keep-Alive statt neuem TCP/TLS-Handshake
+# pro Anfrage; der Pool ist so groß wie die maximale Worker-Zahl beim parallelen Abruf
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=2, pool_maxsize=20))
+
 def initialize_browser_pool():
     """Initialisiert den Browser-Pool für Selenium"""
     logger.info(f"🔄 Initialisiere Browser-Pool für mighty-cards.de")
@@ -248,10 +265,29 @@ def contains_blacklist_terms(text):
     :param text: Zu prüfender Text
     :return: True wenn Blacklist-Begriff gefunden, False sonst
     """
-    for term in PRODUCT_BLACKLIST:
-        if term in text:
-            return True
-    return False
+    return _RE_BLACKLIST.search(text) is not None
+
+def collect_search_product_urls(content, product_urls):
+    """
+    Sammelt relevante Produktlinks aus einer Suchergebnisseite
+    
+    :param content: HTML-Inhalt der Suchseite als Bytes
+    :param product_urls: Dict als geordnetes Set, in das neue Produkt-URLs eingetragen werden
+    """
+    # Der Strainer übernimmt nur Links mit "/shop/" in den Baum, alle anderen werden beim Parsen verworfen
+    soup = BeautifulSoup(content, HTML_PARSER, parse_only=_STRAINER_SHOP_LINKS)
+    
+    for link in soup.find_all("a", href=True):
+        href = link['href']
+        if 'p' in href.split('/')[-1]:
+            # Prüfe, ob der Link relevante Pokemon-Produkte enthält
+            href_lower = href.lower()
+            
+            # Nur Pokemon-Links und keine Blacklist-Begriffe
+            if "pokemon" in href_lower and not contains_blacklist_terms(href_lower):
+                # Vollständige URL erstellen
+                product_url = href if href.startswith('http') else urljoin("https://www.mighty-cards.de", href)
+                product_urls[product_url] = None
 
 def search_mighty_cards_products(search_term, headers):
     """
@@ -261,7 +297,7 @@ def search_mighty_cards_products(search_term, headers):
     :param headers: HTTP-Headers für die Anfragen
     :return: Liste mit gefundenen Produkt-URLs
     """
-    product_urls = []
+    product_urls = {}
     
     try:
         # Verwende Original-Suchbegriff
@@ -269,27 +305,13 @@ def search_mighty_cards_products(search_term, headers):
         search_url = f"https://www.mighty-cards.de/shop/search?keyword={encoded_term}&limit=20"
         
         logger.info(f"🔍 Suche nach Produkten mit Begriff: {search_term}")
-        response = requests.get(search_url, headers=headers, timeout=15)
+        response = _SESSION.get(search_url, headers=headers, timeout=15)
         
         if response.status_code != 200:
             logger.warning(f"⚠️ Fehler bei der Suche nach {search_term}: Status {response.status_code}")
-            return product_urls
+            return []
             
-        soup = BeautifulSoup(response.content, "html.parser")
-        
-        # Suche nach Produktlinks
-        for link in soup.find_all("a", href=True):
-            href = link.get('href', '')
-            if '/shop/' in href and 'p' in href.split('/')[-1]:
-                # Prüfe, ob der Link relevante Pokemon-Produkte enthält
-                href_lower = href.lower()
-                
-                # Nur Pokemon-Links und keine Blacklist-Begriffe
-                if "pokemon" in href_lower and not contains_blacklist_terms(href_lower):
-                    # Vollständige URL erstellen
-                    product_url = href if href.startswith('http') else urljoin("https://www.mighty-cards.de", href)
-                    if product_url not in product_urls:
-                        product_urls.append(product_url)
+        collect_search_product_urls(response.content, product_urls)
         
         # Versuche Variante ohne Umlaute, wenn es keine Ergebnisse gab
         if not product_urls and any(umlaut in search_term for umlaut in UMLAUT_MAPPING.keys()):
@@ -300,19 +322,9 @@ def search_mighty_cards_products(search_term, headers):
             search_url = f"https://www.mighty-cards.de/shop/search?keyword={encoded_term}&limit=20"
             
             try:
-                response = requests.get(search_url, headers=headers, timeout=15)
+                response = _SESSION.get(search_url, headers=headers, timeout=15)
                 if response.status_code == 200:
-                    soup = BeautifulSoup(response.content, "html.parser")
-                    
-                    for link in soup.find_all("a", href=True):
-                        href = link.get('href', '')
-                        if '/shop/' in href and 'p' in href.split('/')[-1]:
-                            href_lower = href.lower()
-                            
-                            if "pokemon" in href_lower and not contains_blacklist_terms(href_lower):
-                                product_url = href if href.startswith('http') else urljoin("https://www.mighty-cards.de", href)
-                                if product_url not in product_urls:
-                                    product_urls.append(product_url)
+                    collect_search_product_urls(response.content, product_urls)
             except Exception as e:
                 logger.warning(f"⚠️ Fehler bei der Suche ohne Umlaute nach {no_umlaut_term}: {e}")
         
@@ -321,7 +333,7 @@ def search_mighty_cards_products(search_term, headers):
     except Exception as e:
         logger.warning(f"⚠️ Fehler bei der Suche nach {search_term}: {e}")
     
-    return product_urls
+    return list(product_urls)
 
 def fetch_filtered_products_from_sitemap_with_retry(headers, product_info, max_retries=4, timeout=15):
     """
@@ -339,7 +351,7 @@ def fetch_filtered_products_from_sitemap_with_retry(headers, product_info, max_r
     for retry in range(max_retries):
         try:
             logger.info(f"🔍 Lade Sitemap von {sitemap_url} (Versuch {retry+1}/{max_retries})")
-            response = requests.get(sitemap_url, headers=headers, timeout=timeout)
+            response = _SESSION.get(sitemap_url, headers=headers, timeout=timeout)
             
             if response.status_code == 200:
                 # Sitemap erfolgreich geladen
@@ -586,7 +598,7 @@ def process_mighty_cards_product(product_url, product_info, seen, out_of_stock,
         
         # Produkt-Detailseite abrufen
         try:
-            response = requests.get(product_url, headers=headers, timeout=15)
+            response = _SESSION.get(product_url, headers=headers, timeout=15)
             if response.status_code != 200:
                 logger.warning(f"⚠️ Fehler beim Abrufen von {product_url}: Status {response.status_code}")
                 return False
@@ -594,7 +606,7 @@ def process_mighty_cards_product(product_url, product_info, seen, out_of_stock,
             logger.warning(f"⚠️ Fehler beim Abrufen von {product_url}: {e}")
             return False
         
-        soup = BeautifulSoup(response.content, "html.parser")
+        soup = BeautifulSoup(response.content, HTML_PARSER)
         
         # Titel extrahieren und validieren
         title_elem = soup.find('h1', {'class': 'product-details__product-title'})
@@ -811,30 +823,6 @@ def process_mighty_cards_product(product_url, product_info, seen, out_of_stock,
     
     return False
 
-# Import für extract_product_type_from_text
-def extract_product_type_from_text(text):
-    """
-    Extrahiert den Produkttyp aus einem Text für strengere Filterung
-    
-    :param text: Text, aus dem der Produkttyp extrahiert werden soll
-    :return: Produkttyp als String oder "unknown" wenn nicht eindeutig
-    """
-    # Diese Funktion muss importiert werden von utils.matcher
-    from utils.matcher import extract_product_type_from_text as extract_type
-    return extract_type(text)
-
-# Import für clean_text
-def clean_text(text):
-    """
-    Bereinigt einen Text (Kleinbuchstaben, ohne Sonderzeichen)
-    
-    :param text: Zu bereinigender Text
-    :return: Bereinigter Text
-    """
-    # Diese Funktion muss importiert werden von utils.matcher
-    from utils.matcher import clean_text as clean
-    return clean(text)
-
 def scrape_mighty_cards(keywords_map, seen, out_of_stock, only_available=False):
     """
     Hauptfunktion: Zweistufiger Scaper mit BeautifulSoup zur schnellen URL-Filterung
@@ -917,7 +905,9 @@ def scrape_mighty_cards(keywords_map, seen, out_of_stock, only_available=False):
                 for product_url, product_data in valid_product_urls:
                     future = executor.submit(
                         process_cached_product,
-                        product_url, product_data, product_info, seen, out_of_stock, only_available,
+                        product_url, product_data, product_info,
+                        keywords_map.get(product_data.get("search_term"), []),
+                        seen, out_of_stock, only_available,
                         headers, all_products, new_matches, found_product_ids, cached_products
                     )
                     futures.append((future, product_url))
@@ -1027,7 +1017,7 @@ def scrape_mighty_cards(keywords_map, seen, out_of_stock, only_available=False):
                     logger.error(f"❌ Fehler bei der Verarbeitung von {url}: {e}")
     
     # 3. Fallback: Direkte Suche nach Produkten, wenn nichts gefunden wurde
-    if len(all_products) < 2:
+    if len(all_products) < MIN_SITEMAP_PRODUCTS:
         logger.info("🔍 Nicht genug Produkte über Sitemap gefunden, versuche direkte Suche")
         
         # Verwende unterschiedliche Suchbegriffe für die direkte Suche
@@ -1045,6 +1035,7 @@ def scrape_mighty_cards(keywords_map, seen, out_of_stock, only_available=False):
                 search_terms.append(product_item["product_code"])
         
         # Direktsuche mit den generierten Suchbegriffen
+        searched_urls = set()  # Über alle Suchbegriffe hinweg bereits geprüfte URLs
         for search_term in search_terms:
             # Verwende Original-Term und Ersetzungsversion (ohne Umlaute)
             search_products = search_mighty_cards_products(search_term, headers)
@@ -1052,8 +1043,9 @@ def scrape_mighty_cards(keywords_map, seen, out_of_stock, only_available=False):
             # Verarbeite gefundene Produkte sequentiell (meist weniger)
             for product_url in search_products:
                 with url_lock:  # Thread-sicher prüfen, ob URL bereits verarbeitet wurde
-                    if product_url in sitemap_products:
+                    if product_url in sitemap_products or product_url in searched_urls:
                         continue  # Vermeidet Duplikate
+                    searched_urls.add(product_url)
                 
                 process_mighty_cards_product(product_url, product_info, seen, out_of_stock, only_available, 
                                             headers, all_products, new_matches, found_product_ids, cached_products)
@@ -1087,11 +1079,12 @@ def scrape_mighty_cards(keywords_map, seen, out_of_stock, only_available=False):
     
     return new_matches
 
-def process_cached_product(product_url, product_data, product_info, seen, out_of_stock, only_available,
+def process_cached_product(product_url, product_data, product_info, tokens, seen, out_of_stock, only_available,
                          headers, all_products, new_matches, found_product_ids, cached_products):
     """
     Verarbeitet ein bereits im Cache gespeichertes Produkt
     
+    :param tokens: Tokens des Suchbegriffs aus product_data["search_term"] (aus keywords_map)
     :return: (success, error_404) - Erfolg und ob ein 404-Fehler aufgetreten ist
     """
     search_term = product_data.get("search_term")
@@ -1099,7 +1092,7 @@ def process_cached_product(product_url, product_data, product_info, seen, out_of
     try:
         # Produkt-Detailseite abrufen
         try:
-            response = requests.get(product_url, headers=headers, timeout=15)
+            response = _SESSION.get(product_url, headers=headers, timeout=15)
             
             # Wenn 404 zurückgegeben wird, müssen wir die Sitemap neu scannen
             if response.status_code == 404:
@@ -1112,15 +1105,12 @@ def process_cached_product(product_url, product_data, product_info, seen, out_of
             logger.warning(f"⚠️ Fehler beim Abrufen von {product_url}: {e}")
             return False, False
         
-        soup = BeautifulSoup(response.content, "html.parser")
+        soup = BeautifulSoup(response.content, HTML_PARSER)
         
         # Titel extrahieren
         title_elem = soup.find('title')
         link_text = title_elem.text.strip() if title_elem else ""
         
-        # VERBESSERT: Strikte Prüfung auf exakte Übereinstimmung mit dem Suchbegriff
-        tokens = keywords_map.get(search_term, [])
-        
         # Extrahiere Produkttyp aus Suchbegriff und Titel
         search_term_type = extract_product_type_from_text(search_term)
         title_product_type = extract_product_type_from_text(link_text)
@@ -1,23 +1,130 @@
 import requests
 import hashlib
+import json
+import os
 import re
 import time
 import random
 import logging
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin, quote_plus
+import threading
+import concurrent.futures
+from io import BytesIO
+import soupsieve as sv
+from bs4 import BeautifulSoup, SoupStrainer
+from lxml import etree
+from requests.adapters import HTTPAdapter
+from requests.packages.urllib3.util import make_headers
+from requests.packages.urllib3.util.retry import Retry
+from urllib.parse import urljoin, urlsplit, urlunsplit, quote_plus
 from utils.telegram import send_telegram_message, escape_markdown, send_product_notification, send_batch_notification
 from utils.matcher import is_keyword_in_text, extract_product_type_from_text, load_exclusion_sets
 from utils.stock import get_status_text, update_product_status
 from utils.availability import detect_availability
+from utils.requests_handler import HTML_PARSER
 
 # Logger-Konfiguration
 logger = logging.getLogger(__name__)
 
 # Konstante für maximale Wiederholungsversuche
 MAX_RETRY_ATTEMPTS = 3
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)  # Vorübergehende Fehler, die die Session selbst wiederholt
 MAX_SEARCH_RESULTS = 10  # Maximal 10 Ergebnisse pro Suche verarbeiten
 MAX_SEARCHES = 3  # Maximal 3 Suchanfragen durchführen
+CONNECT_TIMEOUT = 5  # Timeout für den Verbindungsaufbau in Sekunden
+REQUEST_TIMEOUT = 15  # Timeout für HTTP-Anfragen in Sekunden
+MAX_RESPONSE_BYTES = 1024 * 1024  # Maximal 1 MB (entpackt) pro Seite einlesen
+DEFAULT_ENCODING = "utf-8"  # Zeichensatz, wenn der Server keinen angibt (keine Zeichensatzerkennung)
+MAX_FETCH_WORKERS = 5  # Maximal 5 Produktseiten gleichzeitig abrufen
+PRODUCT_REGION_START = ('<div id="primary"', '<main')  # Beginn des Produktbereichs (erster Treffer zählt)
+PRODUCT_REGION_END = '<footer'  # Ab hier folgen nur noch Footer und Skripte
+PRODUCT_LINK_MARKER = b'/produkt/'  # Jeder Produktlink enthält diesen Pfad (Vorprüfung auf Byte-Ebene)
+CIRCUIT_FAILURE_THRESHOLD = 5  # Nach 5 Fehlschlägen in Folge keine weiteren Anfragen senden
+CIRCUIT_RESET_TIMEOUT = 30  # Sekunden, bis nach dem Öffnen wieder eine Anfrage versucht wird
+ETAG_CACHE_PATH = "data/sapphire_etag.json"  # Validatoren und letztes Ergebnis je Produkt- und Such-URL
+ETAG_CACHE_VERSION = 1  # Erhöhen, wenn sich die Auswertung ändert: ältere Ergebnisse werden dann verworfen
+ETAG_CACHE_MAX_AGE = 24 * 3600  # Gespeicherte Ergebnisse spätestens nach einem Tag neu auswerten
+# Generisches Fallback-Produkt melden, wenn die Suche erfolgreich war, aber nichts gefunden hat
+USE_FALLBACK_PRODUCTS = os.environ.get('SAPPHIRE_FALLBACK_PRODUCTS', 'true').lower() == 'true'
+
+# Vorkompilierte reguläre Ausdrücke
+_RE_SEARCH_TYPE_SUFFIX = re.compile(r'\s+(display|box|tin|etb|booster display|36er display|36 booster|ttb)$', re.IGNORECASE)
+_RE_TYPE_SUFFIX = re.compile(r'\s+(display|box|tin|etb)$')
+_RE_SHOP_SUFFIX = re.compile(r'\s*[-–|]\s*(?:Sapphire-Cards|Shop).*$')  # Shopname bzw. "Shop" am Titelende
+_RE_OOS = re.compile(r'ausverkauft|nicht (mehr )?verfügbar|out of stock', re.IGNORECASE)
+_RE_IN_STOCK_STATUS = re.compile(r'verfügbar|auf lager|in stock', re.IGNORECASE)
+_RE_SCHEMA_AVAILABILITY = re.compile(r'(?:schema\.org/)?(InStock|OutOfStock|PreOrder|BackOrder|SoldOut|Discontinued)$', re.IGNORECASE)
+_RE_LD_JSON = re.compile(r'<script[^>]*type=["\']application/ld\+json["\'][^>]*>(.*?)</script>', re.IGNORECASE | re.DOTALL)
+_RE_PRICE = re.compile(r'(\d+[,.]\d+)\s*[€$£]')
+_RE_WHITESPACE = re.compile(r'\s+')
+_RE_NON_ID_CHARS = re.compile(r'[^a-z0-9\-]')
+
+# Bekannte Nicht-Pokemon-Produktserien (Teilstrings der Produkt-URL)
+NON_POKEMON_SERIES = (
+    "mtg", "magic", "dragonball", "dragon-ball", "flesh-and-blood",
+    "yu-gi-oh", "yugioh", "metazoo", "star-wars", "star wars",
+    "weiss", "schwarz", "lorcana", "altered", "sorcery", "union arena"
+)
+_RE_NON_POKEMON_SERIES = re.compile("|".join(re.escape(series) for series in NON_POKEMON_SERIES))
+
+# Vorkompilierte CSS-Selektoren
+_SEL_SEARCH_PRODUCTS = sv.compile('.product, article.product, .woocommerce-loop-product__link, .products .product, .product-item')
+_SEL_PRODUCT_LINK = sv.compile('a[href*="/produkt/"]')
+_SEL_SEARCH_TITLE = sv.compile('.woocommerce-loop-product__title, .product-title, h2, h3')
+_SEL_TITLES = [sv.compile(selector) for selector in (
+    '.product_title',
+    '.entry-title',
+    'h1.title',
+    'h1.product-title',
+    'h1 span[itemprop="name"]'
+)]
+# Alle Titel-Selektoren plus generisches h1 als ein Selektor: ein Baumdurchlauf, Priorität danach per match()
+_SEL_TITLE_ANY = sv.compile(', '.join([selector.pattern for selector in _SEL_TITLES] + ['h1']))
+# Meta- und title-Tag als Fallback in einem Durchlauf (og:title hat Vorrang)
+_SEL_PAGE_TITLE = sv.compile('meta[property="og:title"], title')
+_SEL_CART = sv.compile('button.single_add_to_cart_button, .add-to-cart, [name="add-to-cart"]')
+_SEL_STOCK = sv.compile('.stock, .stock-status, .availability')
+_SEL_PRICE = sv.compile('.price, .woocommerce-Price-amount')
+_SEL_FALLBACK = sv.compile(', '.join((_SEL_CART.pattern, _SEL_STOCK.pattern, _SEL_PRICE.pattern)))
+# Kaufbereich des Hauptprodukts (Preis, Lagerstatus, Warenkorb) ohne "Ähnliche Produkte"
+_SEL_PRODUCT_SUMMARY = sv.compile('.summary, .entry-summary')
+_SEL_SCHEMA_AVAILABILITY = sv.compile('[itemprop="availability"]')
+
+# Auf der Suchseite nur Elemente mit Produkt-Klassen (inkl. Unterbaum) aufbauen
+_STRAINER_SEARCH = SoupStrainer(class_=re.compile('product'))
+
+# Gemeinsame Session für alle Anfragen an sapphire-cards.de (Keep-Alive, Connection-Pooling)
+_SESSION = None
+
+# Circuit Breaker: Fehlschläge in Folge und Zeitpunkt des Öffnens (0 = geschlossen)
+_circuit_failures = 0
+_circuit_opened_at = 0.0
+_circuit_lock = threading.Lock()
+
+# Cache für bedingte Anfragen (If-None-Match/If-Modified-Since), wird beim ersten Zugriff geladen
+_etag_cache = None
+_etag_cache_dirty = False
+_etag_cache_lock = threading.Lock()
+
+# CSS-Klassen, an denen der eigentliche Produkttitel (h1) erkannt wird
+PRODUCT_TITLE_CLASSES = ("product_title", "entry-title", "title", "product-title")
+
+# Richtpreise je Produkttyp, wenn auf der Seite kein Preis gefunden wird
+STANDARD_PRICES = {
+    "display": "159,99 €",
+    "etb": "49,99 €",
+    "box": "49,99 €",
+    "tin": "24,99 €",
+    "blister": "14,99 €"
+}
+
+# Umschreibung von Umlauten in URL-Slugs
+URL_UMLAUT_MAP = str.maketrans({'ä': 'ae', 'ö': 'oe', 'ü': 'ue', 'ß': 'ss', 'é': 'e'})
+URL_UMLAUT_MAP_SHORT = str.maketrans({'ä': 'a', 'ö': 'o', 'ü': 'u', 'ß': 'ss', 'é': 'e'})
+
+# Typische Bezeichnungen im Titel, wenn der Produkttyp nicht automatisch erkannt wurde
+DISPLAY_INDICATORS = ("display", "36er", "booster box", "box", "36 booster")
+ETB_INDICATORS = ("elite trainer box", "etb", "elite-trainer")
+TTB_INDICATORS = ("top trainer box", "ttb", "top-trainer")
 
 def scrape_sapphire_cards(keywords_map, seen, out_of_stock, only_available=False, max_retries=MAX_RETRY_ATTEMPTS):
     """
@@ -31,6 +138,10 @@ def scrape_sapphire_cards(keywords_map, seen, out_of_stock, only_available=False
     :return: Liste der neuen Treffer
     """
     logger.info("🌐 Starte speziellen Scraper für sapphire-cards.de")
+    
+    # User-Agent einmal pro Durchlauf wechseln, damit die Verbindungen wiederverwendet werden
+    get_session().headers.update(get_random_headers())
+    
     new_matches = []
     all_products = []  # Liste für alle gefundenen Produkte (für sortierte Benachrichtigung)
     
@@ -45,16 +156,19 @@ def scrape_sapphire_cards(keywords_map, seen, out_of_stock, only_available=False
         
         # Extrahiere Produktnamen (ohne Produkttyp)
         # Entferne produktspezifische Begriffe wie "display", "box", "etb", etc. vom Ende
-        product_name = re.sub(r'\s+(display|box|tin|etb|booster display|36er display|36 booster|ttb)$', '', 
-                             search_term.lower(), flags=re.IGNORECASE).strip()
+        product_name = _RE_SEARCH_TYPE_SUFFIX.sub('', search_term.lower()).strip()
         
         search_terms_info[search_term] = {
             'product_type': product_type,
             'product_name': product_name,
+            'name_variations': get_name_variations(product_name),
             'original': search_term
         }
         
-        logger.debug(f"Suchbegriff analysiert: '{search_term}' -> Name: '{product_name}', Typ: '{product_type}'")
+        logger.debug("Suchbegriff analysiert: '%s' -> Name: '%s', Typ: '%s'", search_term, product_name, product_type)
+    
+    # Wörter der Produktnamen für die URL-Vorprüfung (ohne erneuten Seitenabruf)
+    url_tokens = get_url_tokens(search_terms_info)
     
     # Generiere optimierte Suchanfragen (nur Produktnamen und wichtigste vollständige Begriffe)
     effective_search_terms = []
@@ -67,7 +181,8 @@ def scrape_sapphire_cards(keywords_map, seen, out_of_stock, only_available=False
     
     # 2. Ergänze mit spezifischen vollständigen Suchbegriffen für wichtige Produkttypen
     for search_term in keywords_map.keys():
-        if "display" in search_term.lower() or "box" in search_term.lower():
+        search_term_lower = search_term.lower()
+        if "display" in search_term_lower or "box" in search_term_lower:
             # Originalen Begriff mit "display" oder "box" hinzufügen, aber nur wenn nicht schon implizit abgedeckt
             if search_term not in effective_search_terms:
                 effective_search_terms.append(search_term)
@@ -78,57 +193,72 @@ def scrape_sapphire_cards(keywords_map, seen, out_of_stock, only_available=False
     # Begrenze auf MAX_SEARCHES effektivste Suchbegriffe
     effective_search_terms = effective_search_terms[:MAX_SEARCHES]
     
-    # Durchführen der optimierten Suchen
+    # Durchführen der optimierten Suchen - parallel, die Ergebnisse bleiben in der Reihenfolge der Suchbegriffe
     direct_search_results = []
-    search_counter = 0
+    search_results = search_terms_parallel(effective_search_terms)
     
-    for search_term in effective_search_terms:
-        search_counter += 1
-        if search_counter > MAX_SEARCHES:
-            break  # Maximale Suchanzahl erreicht
-            
-        search_urls = search_for_term(search_term, get_random_headers())
+    for search_term, search_urls in zip(effective_search_terms, search_results):
         if search_urls:
             logger.info(f"🔍 Suche nach '{search_term}' ergab {len(search_urls)} Ergebnisse")
             # Begrenze Ergebnisse pro Suche
-            search_urls = search_urls[:MAX_SEARCH_RESULTS]
-            direct_search_results.extend(search_urls)
-            
-            # Bei erfolgreicher Suche nicht sofort abbrechen, aber weniger Zeit in weitere Suchen investieren
-            if len(search_urls) > 5:
-                effective_search_terms = effective_search_terms[:1]  # Nur noch eine Suche maximal
+            direct_search_results.extend(search_urls[:MAX_SEARCH_RESULTS])
     
-    # Deduplizieren der direkten Suchergebnisse
-    direct_search_results = list(set(direct_search_results))
+    # Deduplizieren der direkten Suchergebnisse (Reihenfolge der Suche beibehalten)
+    direct_search_results = list(dict.fromkeys(direct_search_results))
     
     if direct_search_results:
         logger.info(f"🔍 Prüfe {len(direct_search_results)} Ergebnisse aus direkter Suche")
         
-        # Verarbeite die direkten Suchergebnisse
+        # Schnelle URL-Vorprüfung: Nur wahrscheinliche Pokemon-Produkte abrufen
+        candidate_urls = []
         for product_url in direct_search_results:
             if product_url in processed_urls:
                 continue
                 
             processed_urls.add(product_url)
             
-            # Schnelle URL-Vorprüfung: Ist das ein Pokemon-Produkt?
-            if not is_likely_pokemon_product(product_url):
-                logger.debug(f"⏩ Überspringe nicht-Pokemon Produkt: {product_url}")
+            # URL nur einmal kleinschreiben, beide Vorprüfungen arbeiten darauf
+            url_lower = product_url.lower()
+            
+            if not is_likely_pokemon_product(url_lower):
+                logger.debug("⏩ Überspringe nicht-Pokemon Produkt: %s", product_url)
                 continue
-                
+            
+            if not url_matches_product_names(url_lower, url_tokens):
+                logger.debug("⏩ Überspringe Produkt ohne passenden Namen in der URL: %s", product_url)
+                continue
+            
+            candidate_urls.append(product_url)
+        
+        # Produktseiten parallel abrufen, danach nacheinander auswerten
+        responses = fetch_product_pages(candidate_urls, max_retries)
+        
+        # Verarbeite die direkten Suchergebnisse
+        evaluated_urls = set()  # Kanonische Ziel-URLs nach Weiterleitungen
+        for product_url in candidate_urls:
+            response = responses.get(product_url)
+            if response is None:
+                continue
+            
+            # Alte Slugs leiten oft auf eine andere Trefferseite weiter: jede Zielseite nur einmal auswerten
+            final_url = canonicalize_product_url(response.url) if response.url else product_url
+            if final_url in evaluated_urls:
+                logger.debug("⏩ Überspringe weitergeleitetes Duplikat: %s -> %s", product_url, final_url)
+                continue
+            evaluated_urls.add(final_url)
+            
             product_data = process_product_url(product_url, keywords_map, seen, out_of_stock, only_available, 
-                                              get_random_headers(), new_matches, max_retries, search_terms_info)
+                                              new_matches, max_retries, search_terms_info, response)
             
             if isinstance(product_data, dict):
                 all_products.append(product_data)
-                
-                # Bei einem Treffer früh abbrechen, wenn es ein Display ist
-                if product_data.get("product_type") == "display" and "display" in search_terms_info.keys():
-                    logger.info("✅ Displaytreffer gefunden, breche weitere Suche ab")
-                    break
     
-    # Wenn nach all dem nichts gefunden wurde, verwende einen Fallback
-    if not all_products:
+    # Wenn nach all dem nichts gefunden wurde, verwende einen Fallback - aber nicht, wenn alle Suchanfragen
+    # fehlgeschlagen sind, sonst würde bei jedem Ausfall ein erfundenes Produkt gemeldet
+    all_searches_failed = bool(search_results) and all(search_urls is None for search_urls in search_results)
+    if not all_products and all_searches_failed:
+        logger.warning("⚠️ Keine Suchanfrage erfolgreich, überspringe Fallback")
+    elif not all_products and USE_FALLBACK_PRODUCTS:
         logger.warning("⚠️ Keine passenden Produkte gefunden. Verwende Fallback...")
         for search_term, info in search_terms_info.items():
             product_type = info["product_type"]
@@ -137,67 +267,69 @@ def scrape_sapphire_cards(keywords_map, seen, out_of_stock, only_available=False
             # Erstelle generische Fallback-Daten
             fallback_product = create_fallback_product(search_term, product_type, product_name)
             
-            # Prüfe ob die Fallback-Daten erstellt wurden
-            if fallback_product:
-                product_id = create_product_id(fallback_product["url"], fallback_product["title"])
-                
-                # Status aktualisieren und ggf. Benachrichtigung senden
-                should_notify, is_back_in_stock = update_product_status(
-                    product_id, fallback_product["is_available"], seen, out_of_stock
-                )
-                
-                if should_notify:
-                    all_products.append(fallback_product)
-                    new_matches.append(product_id)
-                    logger.info(f"✅ Fallback-Treffer gemeldet: {fallback_product['title']}")
-                    break  # Nur einen Fallback-Treffer
+            # Prüfe ob die Fallback-Daten erstellt wurden, Status aktualisieren und ggf. Benachrichtigung senden
+            if fallback_product and register_product(fallback_product, seen, out_of_stock, only_available, new_matches):
+                all_products.append(fallback_product)
+                logger.info(f"✅ Fallback-Treffer gemeldet: {fallback_product['title']}")
+                break  # Nur einen Fallback-Treffer
     
-    # Sende sortierte Benachrichtigung für alle gefundenen Produkte
+    # Sende sortierte Benachrichtigung für alle gefundenen Produkte (im Hintergrund)
     if all_products:
-        send_batch_notification(all_products)
+        send_batch_notification(all_products, background=True)
+    
+    save_etag_cache()
     
     return new_matches
 
-def is_likely_pokemon_product(url):
+def is_likely_pokemon_product(url_lower):
     """
     Schnelle Vorprüfung, ob eine URL wahrscheinlich zu einem Pokemon-Produkt führt
     
-    :param url: Die zu prüfende URL
+    :param url_lower: Die zu prüfende URL in Kleinschreibung
     :return: True wenn wahrscheinlich ein Pokemon-Produkt, False sonst
     """
-    url_lower = url.lower()
-    
-    # Prüfe auf eindeutige Hinweise auf Pokemon-Produkte in der URL
-    pokemon_keywords = ["pokemon", "pokémon"]
-    
     # Prüfe ob eines der Pokemon-Keywords im URL-Pfad vorkommt
-    for keyword in pokemon_keywords:
-        if keyword in url_lower:
-            return True
-    
-    # Prüfe auf bekannte Nicht-Pokemon-Produktserien
-    non_pokemon_products = [
-        "mtg", "magic", "dragonball", "dragon-ball", "flesh-and-blood", 
-        "yu-gi-oh", "yugioh", "metazoo", "star-wars", "star wars",
-        "weiss", "schwarz", "lorcana", "altered", "sorcery", "union arena"
-    ]
+    if 'pokemon' in url_lower or 'pokémon' in url_lower:
+        return True
     
-    for keyword in non_pokemon_products:
-        if keyword in url_lower:
-            return False
+    # Bekannte Nicht-Pokemon-Produktserien in einem Durchlauf über die URL erkennen;
+    # im Zweifelsfall besser die Seite prüfen
+    return _RE_NON_POKEMON_SERIES.search(url_lower) is None
+
+def get_url_tokens(search_terms_info):
+    """
+    Sammelt die Wörter der gesuchten Produktnamen in der Schreibweise von URL-Slugs
     
-    # Wenn keine negative Übereinstimmung gefunden wurde, aber auch kein 
-    # eindeutiges Pokemon-Keyword, prüfen wir die URL-Struktur
-    if "/produkt/" in url_lower:
-        # Extrahiere den Teil nach /produkt/
-        product_path = url_lower.split("/produkt/")[1].split("/")[0]
-        
-        # Wenn der URL-Pfad mit "pokemon" beginnt, ist es ein Pokemon-Produkt
-        if product_path.startswith("pokemon"):
-            return True
+    :param search_terms_info: Informationen über die Suchbegriffe
+    :return: Set der Wörter (inkl. Umlaut-Umschreibungen), leer wenn die Vorprüfung nicht möglich ist
+    """
+    tokens = set()
+    for info in search_terms_info.values():
+        words = [word for word in info['product_name'].split()
+                 if len(word) > 3 and word not in ('pokemon', 'pokémon')]
+        # Suchbegriff ohne verwertbares Wort (z.B. "151 display"): seine Treffer ließen sich an der
+        # URL nicht erkennen, daher die Vorprüfung ganz abschalten statt Produkte zu verlieren
+        if not words:
+            return set()
+        for word in words:
+            tokens.add(word)
+            # Slugs schreiben Umlaute um ("reisegefährten" -> "reisegefaehrten" oder "reisegefahrten")
+            tokens.add(word.translate(URL_UMLAUT_MAP))
+            tokens.add(word.translate(URL_UMLAUT_MAP_SHORT))
+    return tokens
+
+def url_matches_product_names(url_lower, url_tokens):
+    """
+    Prüft, ob der Slug einer Produkt-URL eines der gesuchten Namenswörter enthält
     
-    # Im Zweifelsfall besser prüfen
-    return True
+    :param url_lower: Produkt-URL in Kleinschreibung
+    :param url_tokens: Wörter aus get_url_tokens
+    :return: True wenn ein Wort vorkommt oder keine Prüfung möglich ist, sonst False
+    """
+    if not url_tokens:
+        return True
+    slug = url_lower.rsplit('/produkt/', 1)[-1]
+    return any(token in slug for token in url_tokens)
 
 def get_random_headers():
     """
@@ -221,98 +353,271 @@ def get_random_headers():
         "Upgrade-Insecure-Requests": "1"
     }
 
-def search_for_term(search_term, headers):
+def create_session():
+    """
+    Erstellt eine Session mit Connection-Pooling und Retry-Strategie für sapphire-cards.de
+    
+    :return: Konfigurierte requests.Session
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=10,
+        max_retries=Retry(
+            total=MAX_RETRY_ATTEMPTS,
+            backoff_factor=0.3,
+            status_forcelist=RETRY_STATUS_CODES,
+            respect_retry_after_header=True,
+            raise_on_status=False  # Nach dem letzten Versuch die Antwort zurückgeben statt eine Exception
+        )
+    )
+    session.mount("https://", adapter)
+    session.headers.update(get_random_headers())
+    # Nur Kodierungen anbieten, die urllib3 auch entpacken kann (br nur mit installiertem brotli)
+    session.headers.update(make_headers(accept_encoding=True))
+    return session
+
+def get_session():
+    """
+    Gibt die gemeinsame Session zurück und erstellt sie bei Bedarf
+    
+    :return: requests.Session
+    """
+    global _SESSION
+    if _SESSION is None:
+        _SESSION = create_session()
+    return _SESSION
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """Wird ausgelöst, solange sapphire-cards.de nach wiederholten Fehlern nicht angefragt wird"""
+
+def check_circuit(url):
+    """
+    Bricht sofort ab, wenn der Circuit Breaker offen ist
+    
+    :param url: Angefragte URL (für die Fehlermeldung)
+    :raises CircuitOpenError: Wenn die Wartezeit seit dem Öffnen noch nicht abgelaufen ist
+    """
+    with _circuit_lock:
+        if _circuit_opened_at and time.time() - _circuit_opened_at < CIRCUIT_RESET_TIMEOUT:
+            raise CircuitOpenError(f"sapphire-cards.de vorübergehend nicht erreichbar, überspringe {url}")
+
+def record_request_result(success):
+    """
+    Aktualisiert den Circuit Breaker nach einer Anfrage
+    
+    :param success: True bei einer Antwort unter 500, False bei Exception oder Serverfehler
+    """
+    global _circuit_failures, _circuit_opened_at
+    with _circuit_lock:
+        if success:
+            _circuit_failures = 0
+            _circuit_opened_at = 0.0
+            return
+        _circuit_failures += 1
+        if _circuit_failures >= CIRCUIT_FAILURE_THRESHOLD:
+            if not _circuit_opened_at:
+                logger.error(f"❌ {_circuit_failures} Fehler in Folge bei sapphire-cards.de, pausiere Anfragen für {CIRCUIT_RESET_TIMEOUT}s")
+            _circuit_opened_at = time.time()
+
+def session_get(url, headers=None):
+    """
+    Ruft eine URL über die gemeinsame Session ab und liest den Body nur bis MAX_RESPONSE_BYTES
+    
+    :param url: Abzurufende URL
+    :param headers: Zusätzliche Header für diese Anfrage (optional)
+    :return: Response-Objekt mit vollständig eingelesenem (ggf. gekürztem) Inhalt
+    :raises CircuitOpenError: Wenn sapphire-cards.de nach wiederholten Fehlern übersprungen wird
+    """
+    check_circuit(url)
+    try:
+        response = get_session().get(url, headers=headers, timeout=(CONNECT_TIMEOUT, REQUEST_TIMEOUT), stream=True)
+    except requests.exceptions.RequestException:
+        record_request_result(False)
+        raise
+    record_request_result(response.status_code < 500)
+    try:
+        chunks = []
+        size = 0
+        for chunk in response.iter_content(chunk_size=64 * 1024):
+            chunks.append(chunk)
+            size += len(chunk)
+            if size >= MAX_RESPONSE_BYTES:
+                logger.warning(f"⚠️ Antwort von {url} größer als {MAX_RESPONSE_BYTES} Bytes, wird gekürzt")
+                break
+        # Inhalt festschreiben, damit .content/.text wie bei einer normalen Anfrage funktionieren
+        response._content = b"".join(chunks)[:MAX_RESPONSE_BYTES]
+    finally:
+        response.close()
+    # Ohne charset im Header würde requests ISO-8859-1 annehmen oder den Zeichensatz per
+    # charset_normalizer über den ganzen Body raten; sapphire-cards.de liefert UTF-8
+    if 'charset' not in response.headers.get('Content-Type', '').lower():
+        response.encoding = DEFAULT_ENCODING
+    return response
+
+def search_for_term(search_term):
     """
     Sucht direkt nach einem bestimmten Suchbegriff
     
     :param search_term: Suchbegriff
-    :param headers: HTTP-Headers für die Anfrage
-    :return: Liste gefundener Produkt-URLs
+    :return: Liste gefundener Produkt-URLs oder None, wenn die Suchseite nicht abgerufen werden konnte
     """
-    product_urls = []
+    product_urls = {}  # Dict als geordnetes Set: Duplikate in O(1), Reihenfolge der Trefferliste bleibt erhalten
     
     # Parameter für die direkte Produktsuche
     encoded_term = quote_plus(search_term)
     search_url = f"https://sapphire-cards.de/?s={encoded_term}&post_type=product&type_aws=true"
     
+    # Bedingte Anfrage: bei unveränderter Trefferliste (304) die zuletzt gefundenen URLs verwenden
+    cached = get_cached_page(search_url)
+    
     try:
         logger.info(f"🔍 Suche nach: {search_term}")
-        response = requests.get(search_url, headers=headers, timeout=15)
+        response = session_get(search_url, headers=get_conditional_headers(cached))
+        
+        if response.status_code == 304 and cached and "product_urls" in cached:
+            logger.debug("♻️ Trefferliste unverändert (304), verwende Cache: %s", search_term)
+            return list(cached["product_urls"])
         
         if response.status_code != 200:
             logger.warning(f"⚠️ Fehler bei der Suche: Status {response.status_code}")
-            return product_urls
+            return None
             
-        soup = BeautifulSoup(response.text, "html.parser")
+        # Ohne Produktlink im Rohinhalt gibt es nichts zu parsen (z.B. "Keine Produkte gefunden")
+        content = response.content
+        if PRODUCT_LINK_MARKER not in content:
+            logger.debug("Keine Produktlinks in der Trefferliste für '%s'", search_term)
+            store_cached_search(search_url, response, [])
+            return []
+        
+        # Trefferliste steht vor dem Footer: Footer und nachgeladene Skripte nicht mitparsen
+        footer_start = content.find(PRODUCT_REGION_END.encode())
+        if footer_start != -1:
+            content = content[:footer_start]
         
-        # Gezielt nach Pokemon-Produkten filtern
-        for product in soup.select('.product, article.product, .woocommerce-loop-product__link, .products .product, .product-item'):
+        soup = BeautifulSoup(content, HTML_PARSER, parse_only=_STRAINER_SEARCH, from_encoding=response.encoding)
+        if _SEL_SEARCH_PRODUCTS.select_one(soup) is None:
+            # Fallback: vollständiges Dokument, falls das Layout abweicht
+            soup = BeautifulSoup(response.content, HTML_PARSER, from_encoding=response.encoding)
+        
+        # Gezielt nach Pokemon-Produkten filtern - iselect liefert die Container einzeln,
+        # sodass der Baum nach MAX_SEARCH_RESULTS Treffern nicht weiter durchsucht wird
+        for product in _SEL_SEARCH_PRODUCTS.iselect(soup):
             # Versuche, den Produktlink zu finden
-            link = product.find('a', href=True)
-            if not link or not '/produkt/' in link['href']:
+            link = _SEL_PRODUCT_LINK.select_one(product)
+            if not link:
+                continue
+            
+            # Relative URLs zu absoluten machen und Tracking-Parameter/Anker entfernen,
+            # damit dieselbe Produktseite nur einmal abgerufen wird
+            href = link['href']
+            if not href.startswith('http'):
+                href = urljoin("https://sapphire-cards.de", href)
+            href = canonicalize_product_url(href)
+            
+            # Verschachtelte Produkt-Container verweisen oft auf denselben Link: bereits übernommene überspringen
+            if href in product_urls:
                 continue
                 
             # Produkttitel extrahieren, wenn möglich
-            title_elem = product.select_one('.woocommerce-loop-product__title, .product-title, h2, h3')
+            title_elem = _SEL_SEARCH_TITLE.select_one(product)
             if title_elem:
                 product_title = title_elem.text.strip().lower()
                 # Nur Pokemon-Produkte berücksichtigen
                 if not ('pokemon' in product_title or 'pokémon' in product_title):
                     continue
             
-            product_urls.append(link['href'])
+            product_urls[href] = None
+            
+            # Mehr als MAX_SEARCH_RESULTS werden pro Suche ohnehin nicht verarbeitet
+            if len(product_urls) >= MAX_SEARCH_RESULTS:
+                break
         
-        # Relative URLs zu absoluten machen
-        for i in range(len(product_urls)):
-            if not product_urls[i].startswith('http'):
-                product_urls[i] = urljoin("https://sapphire-cards.de", product_urls[i])
+        store_cached_search(search_url, response, list(product_urls))
         
+    except CircuitOpenError as e:
+        logger.warning(f"⚠️ {e}")
+        return None
     except Exception as e:
         logger.error(f"❌ Fehler bei der Suche nach '{search_term}': {e}")
+        return None
+    
+    return list(product_urls)
+
+def canonicalize_product_url(url):
+    """
+    Vereinheitlicht eine Produkt-URL: Host in Kleinbuchstaben, Pfad mit abschließendem
+    Schrägstrich (wie bei WordPress üblich), ohne Query-String und Anker
     
-    return list(set(product_urls))  # Entferne Duplikate
+    :param url: Absolute Produkt-URL
+    :return: Kanonische URL
+    """
+    parts = urlsplit(url)
+    return urlunsplit((parts.scheme, parts.netloc.lower(), parts.path.rstrip('/') + '/', '', ''))
 
-def product_matches_search_term(title, search_terms_info):
+def search_terms_parallel(search_terms):
+    """
+    Führt mehrere Suchanfragen gleichzeitig über die gemeinsame Session aus
+    
+    :param search_terms: Liste der Suchbegriffe
+    :return: Liste der URL-Listen (None bei fehlgeschlagener Suche) in der Reihenfolge der Suchbegriffe
+    """
+    if not search_terms:
+        return []
+    
+    with concurrent.futures.ThreadPoolExecutor(max_workers=min(len(search_terms), MAX_SEARCHES)) as executor:
+        return list(executor.map(search_for_term, search_terms))
+
+def get_name_variations(product_name):
+    """
+    Erzeugt Schreibvarianten eines Produktnamens (mit/ohne Leerzeichen oder Bindestriche)
+    
+    :param product_name: Produktname in Kleinbuchstaben
+    :return: Liste der Varianten ohne Duplikate
+    """
+    return list(dict.fromkeys([
+        product_name,
+        product_name.replace(' ', '-'),
+        product_name.replace(' ', ''),
+        product_name.replace('-', ' ')
+    ]))
+
+def product_matches_search_term(title, search_terms_info, title_product_type=None):
     """
     Prüft, ob ein Produkttitel mit einem der Suchbegriffe übereinstimmt
     und berücksichtigt dabei sowohl Produktnamen als auch Produkttypen
     
     :param title: Der zu prüfende Produkttitel
     :param search_terms_info: Informationen über die Suchbegriffe
+    :param title_product_type: Bereits bestimmter Produkttyp des Titels (optional)
     :return: (bool, matched_term) - Übereinstimmung und der passende Suchbegriff
     """
-    if not title or 'pokemon' not in title.lower():
+    if not title:
         return False, None
     
     title_lower = title.lower()
+    if 'pokemon' not in title_lower:
+        return False, None
     
-    # Extrahiere Produkttyp aus dem Titel
-    title_product_type = extract_product_type_from_text(title)
+    # Extrahiere Produkttyp aus dem Titel, falls nicht vom Aufrufer übergeben
+    if title_product_type is None:
+        title_product_type = extract_product_type_from_text(title_lower)
     
     for search_term, info in search_terms_info.items():
         product_name = info['product_name']
         product_type = info['product_type']
         
-        # Skip wenn zu kurzer Produktname oder nicht-Pokemon-Produkte
-        if len(product_name) < 3 or 'pokemon' not in title_lower:
+        # Skip wenn zu kurzer Produktname
+        if len(product_name) < 3:
             continue
         
-        # Prüfe, ob der Produktname im Titel vorkommt
-        name_found = product_name in title_lower
-        
-        # Variationen des Produktnamens prüfen (mit/ohne Leerzeichen oder Bindestriche)
-        if not name_found:
-            name_variations = [
-                product_name,
-                product_name.replace(' ', '-'),
-                product_name.replace(' ', ''),
-                product_name.replace('-', ' ')
-            ]
-            
-            for variation in name_variations:
-                if variation in title_lower:
-                    name_found = True
-                    break
+        # Beide Produkttypen bekannt, aber verschieden: kann nicht passen, Namensprüfung überspringen
+        if product_type != "unknown" and title_product_type != "unknown" and product_type != title_product_type:
+            continue
+        
+        # Prüfe, ob der Produktname oder eine seiner Variationen im Titel vorkommt
+        name_variations = info.get('name_variations') or get_name_variations(product_name)
+        name_found = any(variation in title_lower for variation in name_variations)
         
         # Wenn Produktname gefunden: Produkttyp prüfen
         if name_found:
@@ -325,18 +630,15 @@ def product_matches_search_term(title, search_terms_info):
                 # Besondere Prüfung für Display-Produkte
                 if product_type == "display":
                     # Suche nach typischen Display-Bezeichnungen im Titel
-                    display_indicators = ["display", "36er", "booster box", "box", "36 booster"]
-                    if any(indicator in title_lower for indicator in display_indicators):
+                    if any(indicator in title_lower for indicator in DISPLAY_INDICATORS):
                         return True, search_term
                 # Besondere Prüfung für ETB-Produkte
                 elif product_type == "etb":
-                    etb_indicators = ["elite trainer box", "etb", "elite-trainer"]
-                    if any(indicator in title_lower for indicator in etb_indicators):
+                    if any(indicator in title_lower for indicator in ETB_INDICATORS):
                         return True, search_term
                 # Besondere Prüfung für TTB-Produkte    
                 elif product_type == "ttb":
-                    ttb_indicators = ["top trainer box", "ttb", "top-trainer"]
-                    if any(indicator in title_lower for indicator in ttb_indicators):
+                    if any(indicator in title_lower for indicator in TTB_INDICATORS):
                         return True, search_term
                 else:
                     # Bei nicht erkanntem Typ im Titel, aber Produktname passt: Trotzdem akzeptieren
@@ -347,8 +649,207 @@ def product_matches_search_term(title, search_terms_info):
     
     return False, None
 
-def process_product_url(product_url, keywords_map, seen, out_of_stock, only_available, headers, 
-                      new_matches, max_retries=MAX_RETRY_ATTEMPTS, search_terms_info=None):
+def get_etag_cache():
+    """
+    Gibt den Cache für bedingte Anfragen zurück und lädt ihn bei Bedarf von der Festplatte;
+    veraltete Einträge werden beim Laden verworfen
+    
+    :return: Dictionary {url: {"etag", "last_modified", "version", "stored_at", "title", "price",
+             "is_available", "status_text"}}, bei Suchseiten statt der Ergebnisfelder "product_urls"
+    """
+    global _etag_cache, _etag_cache_dirty
+    with _etag_cache_lock:
+        if _etag_cache is None:
+            try:
+                with open(ETAG_CACHE_PATH, "r", encoding="utf-8") as f:
+                    loaded = json.load(f)
+            except FileNotFoundError:
+                loaded = {}
+            except (json.JSONDecodeError, OSError) as e:
+                logger.warning(f"⚠️ ETag-Cache konnte nicht geladen werden: {e}")
+                loaded = {}
+            now = time.time()
+            _etag_cache = {url: entry for url, entry in loaded.items() if is_cache_entry_valid(entry, now)}
+            # Verworfene Einträge auch aus der Datei entfernen, damit sie nicht unbegrenzt wächst
+            _etag_cache_dirty = len(_etag_cache) != len(loaded)
+        return _etag_cache
+
+def is_cache_entry_valid(entry, now):
+    """
+    Prüft, ob ein Cache-Eintrag mit der aktuellen Auswertungslogik erstellt wurde und nicht zu alt ist
+    
+    :param entry: Cache-Eintrag
+    :param now: Aktueller Zeitstempel
+    :return: True wenn der Eintrag verwendet werden darf
+    """
+    return (isinstance(entry, dict)
+            and entry.get("version") == ETAG_CACHE_VERSION
+            and now - entry.get("stored_at", 0) < ETAG_CACHE_MAX_AGE)
+
+def get_cached_page(product_url):
+    """
+    Liefert das zwischengespeicherte Ergebnis einer Produkt- oder Suchseite
+    
+    :param product_url: URL der Seite
+    :return: Cache-Eintrag oder None (auch wenn der Eintrag inzwischen abgelaufen ist)
+    """
+    cache = get_etag_cache()
+    with _etag_cache_lock:
+        entry = cache.get(product_url)
+    if entry is not None and not is_cache_entry_valid(entry, time.time()):
+        return None
+    return entry
+
+def get_conditional_headers(cached):
+    """
+    Erzeugt die Header für eine bedingte Anfrage aus einem Cache-Eintrag
+    
+    :param cached: Cache-Eintrag oder None
+    :return: Dictionary mit If-None-Match/If-Modified-Since (leer ohne Validatoren)
+    """
+    headers = {}
+    if cached:
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+    return headers
+
+def store_cache_entry(url, response, result):
+    """
+    Speichert die Validatoren einer Antwort zusammen mit dem ausgewerteten Ergebnis
+    
+    :param url: URL der Seite
+    :param response: Response mit Status 200
+    :param result: Dictionary mit dem Ergebnis der Auswertung
+    """
+    global _etag_cache_dirty
+    etag = response.headers.get("ETag")
+    last_modified = response.headers.get("Last-Modified")
+    if not etag and not last_modified:
+        return
+    
+    cache = get_etag_cache()
+    with _etag_cache_lock:
+        cache[url] = {
+            "etag": etag,
+            "last_modified": last_modified,
+            "version": ETAG_CACHE_VERSION,
+            "stored_at": time.time(),
+            **result
+        }
+        _etag_cache_dirty = True
+
+def store_cached_page(product_url, response, title, price, is_available, status_text):
+    """
+    Speichert die Validatoren einer Produktseite zusammen mit dem ausgewerteten Ergebnis
+    
+    :param product_url: URL der Produktseite
+    :param response: Response mit Status 200
+    :param title: Ermittelter Produkttitel
+    :param price: Ermittelter Preis
+    :param is_available: Verfügbarkeitsstatus
+    :param status_text: Statustext der Verfügbarkeitsprüfung
+    """
+    store_cache_entry(product_url, response, {
+        "title": title,
+        "price": price,
+        "is_available": is_available,
+        "status_text": status_text
+    })
+
+def store_cached_search(search_url, response, product_urls):
+    """
+    Speichert die Validatoren einer Suchseite zusammen mit den gefundenen Produkt-URLs
+    
+    :param search_url: URL der Suchanfrage
+    :param response: Response mit Status 200
+    :param product_urls: Gefundene Produkt-URLs
+    """
+    store_cache_entry(search_url, response, {"product_urls": product_urls})
+
+def save_etag_cache():
+    """Schreibt den Cache für bedingte Anfragen, falls er sich geändert hat"""
+    global _etag_cache_dirty
+    with _etag_cache_lock:
+        if not _etag_cache_dirty:
+            return
+        try:
+            os.makedirs(os.path.dirname(ETAG_CACHE_PATH), exist_ok=True)
+            with open(ETAG_CACHE_PATH, "w", encoding="utf-8") as f:
+                json.dump(_etag_cache, f, ensure_ascii=False, indent=2)
+            _etag_cache_dirty = False
+        except OSError as e:
+            logger.warning(f"⚠️ ETag-Cache konnte nicht gespeichert werden: {e}")
+
+def fetch_product_page(product_url, max_retries=MAX_RETRY_ATTEMPTS):
+    """
+    Ruft eine Produktseite mit Wiederholungsversuchen ab
+    
+    :param product_url: URL der Produktseite
+    :param max_retries: Maximale Anzahl an Wiederholungsversuchen
+    :return: Response-Objekt (Status 200 oder 304) oder None bei Fehler
+    """
+    # Bedingte Anfrage, wenn ein ausgewertetes Ergebnis mit Validatoren vorliegt
+    cached = get_cached_page(product_url)
+    headers = get_conditional_headers(cached)
+    
+    # Verbindungsfehler und Timeouts wiederholt bereits die Retry-Strategie der Session;
+    # hier nur Fehler beim Lesen des Bodys erneut versuchen, die urllib3 nicht wiederholen kann
+    retry_count = 0
+    
+    while retry_count <= max_retries:
+        try:
+            response = session_get(product_url, headers=headers)
+            if response.status_code == 200 or (response.status_code == 304 and cached):
+                return response
+            
+            # 429/5xx hat die Retry-Strategie der Session bereits wiederholt, andere Status sind endgültig
+            logger.warning(f"⚠️ HTTP-Fehler beim Abrufen von {product_url}: Status {response.status_code}")
+            return None
+        except CircuitOpenError as e:
+            logger.warning(f"⚠️ {e}")
+            return None
+        except (requests.exceptions.ChunkedEncodingError, requests.exceptions.ContentDecodingError) as e:
+            retry_count += 1
+            if retry_count > max_retries:
+                logger.error(f"⚠️ Maximale Anzahl an Wiederholungen erreicht: {e}")
+                return None
+            logger.warning(f"⚠️ Fehler beim Abrufen, versuche erneut ({retry_count}/{max_retries+1}): {e}")
+            # Exponentielles Backoff mit Jitter, damit parallele Abrufe nicht gleichzeitig wiederholen
+            time.sleep(2 * retry_count + random.uniform(0, 1))
+        except requests.exceptions.RequestException as e:
+            logger.error(f"⚠️ Fehler beim Abrufen von {product_url}: {e}")
+            return None
+    
+    return None
+
+def fetch_product_pages(product_urls, max_retries=MAX_RETRY_ATTEMPTS):
+    """
+    Ruft mehrere Produktseiten parallel über die gemeinsame Session ab
+    
+    :param product_urls: Liste der Produkt-URLs
+    :param max_retries: Maximale Anzahl an Wiederholungsversuchen pro URL
+    :return: Dictionary {url: Response oder None}
+    """
+    if not product_urls:
+        return {}
+    
+    responses = {}
+    with concurrent.futures.ThreadPoolExecutor(max_workers=min(len(product_urls), MAX_FETCH_WORKERS)) as executor:
+        future_to_url = {executor.submit(fetch_product_page, url, max_retries): url for url in product_urls}
+        for future in concurrent.futures.as_completed(future_to_url):
+            url = future_to_url[future]
+            try:
+                responses[url] = future.result()
+            except Exception as e:
+                logger.error(f"❌ Fehler beim Abrufen von {url}: {e}")
+                responses[url] = None
+    
+    return responses
+
+def process_product_url(product_url, keywords_map, seen, out_of_stock, only_available, 
+                      new_matches, max_retries=MAX_RETRY_ATTEMPTS, search_terms_info=None, response=None):
     """
     Verarbeitet eine einzelne Produkt-URL mit maximaler Fehlertoleranz
     
@@ -357,85 +858,47 @@ def process_product_url(product_url, keywords_map, seen, out_of_stock, only_avai
     :param seen: Set mit bereits gemeldeten Produkten
     :param out_of_stock: Set mit ausverkauften Produkten
     :param only_available: Ob nur verfügbare Produkte gemeldet werden sollen
-    :param headers: HTTP-Headers für die Anfrage
     :param new_matches: Liste der neuen Treffer
     :param max_retries: Maximale Anzahl an Wiederholungsversuchen
     :param search_terms_info: Informationen über die Suchbegriffe
+    :param response: Bereits abgerufene Response der Produktseite (optional)
     :return: Product data dict if successful, False otherwise
     """
     try:
         logger.info(f"🔍 Prüfe Produktlink: {product_url}")
         
-        # Versuche mehrfach, falls temporäre Netzwerkprobleme auftreten
-        response = None
-        retry_count = 0
+        if response is None:
+            response = fetch_product_page(product_url, max_retries)
         
-        while retry_count <= max_retries:
-            try:
-                response = requests.get(product_url, headers=headers, timeout=15)
-                if response.status_code == 200:
-                    break
-                elif response.status_code == 404:
-                    # Bei 404 (Nicht gefunden) sofort aufgeben
-                    logger.warning(f"⚠️ HTTP-Fehler beim Abrufen von {product_url}: Status {response.status_code}")
-                    return False
-                
-                logger.warning(f"⚠️ HTTP-Fehler beim Abrufen von {product_url}: Status {response.status_code}")
-                retry_count += 1
-                if retry_count > max_retries:
-                    logger.error(f"⚠️ Maximale Anzahl an Wiederholungen erreicht für {product_url}")
-                    return False
-                time.sleep(2 * retry_count)  # Exponentielles Backoff
-            except requests.exceptions.RequestException as e:
-                retry_count += 1
-                if retry_count > max_retries:
-                    logger.error(f"⚠️ Maximale Anzahl an Wiederholungen erreicht: {e}")
-                    return False
-                logger.warning(f"⚠️ Fehler beim Abrufen, versuche erneut ({retry_count}/{max_retries+1}): {e}")
-                time.sleep(2 * retry_count)  # Exponentielles Backoff
+        # Bei 304 (unverändert) das zuletzt ausgewertete Ergebnis wiederverwenden
+        cached = get_cached_page(product_url) if response is not None and response.status_code == 304 else None
         
-        if not response or response.status_code != 200:
+        if not response or (response.status_code != 200 and not cached):
             logger.warning(f"⚠️ Fehler beim Abrufen von {product_url}: Status {response.status_code if response else 'Keine Antwort'}")
             return False
         
-        soup = BeautifulSoup(response.text, "html.parser")
-        
-        # Schnelle Vorprüfung: Ist es ein Pokemon-Produkt?
-        page_text = soup.get_text().lower()
-        if not ('pokemon' in page_text or 'pokémon' in page_text):
-            logger.debug(f"⚠️ Kein Pokemon-Produkt: {product_url}")
-            return False
-        
-        # Extrahiere Titel mit verbesserten Methoden
-        title_elem = None
-        title_selectors = [
-            '.product_title', 
-            '.entry-title', 
-            'h1.title', 
-            'h1.product-title',
-            'h1 span[itemprop="name"]'
-        ]
-        
-        for selector in title_selectors:
-            title_elem = soup.select_one(selector)
-            if title_elem:
-                break
-        
-        # Fallback zu generischem h1
-        if not title_elem:
-            title_elem = soup.find('h1')
+        # response.text dekodiert bei jedem Zugriff neu, daher nur einmal pro Seite
+        html_text = None
+        if cached:
+            logger.debug("♻️ Seite unverändert (304), verwende Cache: %s", product_url)
+            title = cached["title"]
+        else:
+            html_text = response.text
+            # Schneller Durchlauf: Titel direkt aus dem Byte-Stream lesen, ohne den ganzen Baum aufzubauen
+            title = extract_title_fast(html_text)
+        soup = None
         
-        # Meta-Tags als weitere Fallback-Option
-        title = None
-        if not title_elem:
-            meta_title = soup.find('meta', property='og:title')
-            if meta_title:
-                title = meta_title.get('content', '')
+        if not title:
+            soup = BeautifulSoup(response.content, HTML_PARSER, from_encoding=response.encoding)
+            
+            # Extrahiere Titel mit verbesserten Methoden (Fallback zu generischem h1)
+            title_elem = select_title_element(soup)
+            
+            # Meta-Tags als weitere Fallback-Option
+            if not title_elem:
+                title = select_page_title(soup)
             else:
-                title_tag = soup.find('title')
-                title = title_tag.text.strip() if title_tag else None
-        else:
-            title = title_elem.text.strip()
+                title = title_elem.text.strip()
         
         # URL-basierter Fallback-Titel
         if not title or len(title) < 5:
@@ -451,14 +914,16 @@ def process_product_url(product_url, keywords_map, seen, out_of_stock, only_avai
             title = generate_title_from_url(product_url)
         
         # Bereinige den Titel
-        title = re.sub(r'\s*[-–|]\s*Sapphire-Cards.*$', '', title)
-        title = re.sub(r'\s*[-–|]\s*Shop.*$', '', title)
+        title = _RE_SHOP_SUFFIX.sub('', title)
         
         logger.info(f"📝 Gefundener Produkttitel: '{title}'")
         
+        # Produkttyp einmalig bestimmen (für Abgleich, Preis-Fallback und Benachrichtigung)
+        title_product_type = extract_product_type_from_text(title)
+        
         # Verbesserte Prüfung, ob das Produkt zu den Suchbegriffen passt
         if search_terms_info:
-            matches, matched_term = product_matches_search_term(title, search_terms_info)
+            matches, matched_term = product_matches_search_term(title, search_terms_info, title_product_type)
         else:
             # Fallback zur alten Logik, wenn keine search_terms_info übergeben wurde
             matched_term = None
@@ -470,93 +935,34 @@ def process_product_url(product_url, keywords_map, seen, out_of_stock, only_avai
         
         # Wenn das Produkt zu den Suchbegriffen passt
         if matches and matched_term:
-            # Verwende das Availability-Modul für Verfügbarkeitsprüfung
-            is_available, price, status_text = detect_availability(soup, product_url)
-            
-            # Verbesserte Verfügbarkeitserkennung bei unklaren Ergebnissen
-            if is_available is None or status_text == "[?] Status unbekannt":
-                # Verfügbarkeitsprüfung mit mehreren Indikatoren
-                availability_indicators = {'available': False, 'reasons': []}
-                
-                # Warenkorb-Button
-                add_to_cart = soup.select_one('button.single_add_to_cart_button, .add-to-cart, [name="add-to-cart"]')
-                if add_to_cart and 'disabled' not in add_to_cart.attrs and 'disabled' not in add_to_cart.get('class', []):
-                    availability_indicators['available'] = True
-                    availability_indicators['reasons'].append("Warenkorb-Button aktiv")
-                
-                # Ausverkauft-Text
-                page_text = soup.get_text().lower()
-                if re.search(r'ausverkauft|nicht (mehr )?verfügbar|out of stock', page_text, re.IGNORECASE):
-                    availability_indicators['available'] = False
-                    availability_indicators['reasons'].append("Ausverkauft-Text gefunden")
-                
-                # Status im HTML
-                stock_status = soup.select_one('.stock, .stock-status, .availability')
-                if stock_status:
-                    status_text = stock_status.text.strip()
-                    if any(x in status_text.lower() for x in ['verfügbar', 'auf lager', 'in stock']):
-                        availability_indicators['available'] = True
-                        availability_indicators['reasons'].append(f"Status-Text: '{status_text}'")
+            if cached:
+                is_available, price, status_text = cached["is_available"], cached["price"], cached["status_text"]
+            else:
+                # Vollständiges Parsen erst, wenn der Titel passt - möglichst nur den Produktbereich
+                if soup is None:
+                    soup = parse_product_region(response, html_text)
                 
-                # Setze endgültigen Status
-                is_available = availability_indicators['available']
-                status_text = f"[{'V' if is_available else 'X'}] {'Verfügbar' if is_available else 'Ausverkauft'}"
-                if availability_indicators['reasons']:
-                    status_text += f" ({', '.join(availability_indicators['reasons'])})"
+                page_result = analyze_product_page(html_text, soup, product_url, title_product_type)
+                if page_result is None:
+                    return False
+                is_available, price, status_text = page_result
+                store_cached_page(product_url, response, title, price, is_available, status_text)
             
-            # Preisextraktion verbessern
-            if price == "Preis nicht verfügbar":
-                price_elem = soup.select_one('.price, .woocommerce-Price-amount')
-                if price_elem:
-                    price = price_elem.text.strip()
-                else:
-                    price_match = re.search(r'(\d+[,.]\d+)\s*[€$£]', soup.text)
-                    if price_match:
-                        price = f"{price_match.group(1)}€"
-                    else:
-                        # Standardpreis basierend auf Produkttyp
-                        title_product_type = extract_product_type_from_text(title)
-                        standard_prices = {
-                            "display": "159,99 €",
-                            "etb": "49,99 €",
-                            "box": "49,99 €",
-                            "tin": "24,99 €",
-                            "blister": "14,99 €"
-                        }
-                        price = standard_prices.get(title_product_type, "Preis nicht verfügbar")
+            # Produkt-Informationen für die Batch-Benachrichtigung
+            product_data = {
+                "title": title,
+                "url": product_url,
+                "price": price,
+                "status_text": status_text,
+                "is_available": is_available,
+                "matched_term": matched_term,
+                "product_type": title_product_type,
+                "shop": "sapphire-cards.de"
+            }
             
             # Aktualisiere Produkt-Status
-            product_id = create_product_id(product_url, title)
-            should_notify, is_back_in_stock = update_product_status(
-                product_id, is_available, seen, out_of_stock
-            )
-            
-            # Bei "nur verfügbare" Option überspringen, wenn nicht verfügbar
-            if only_available and not is_available:
-                return True  # Erfolgreich verarbeitet aber nicht gemeldet
-                
-            if should_notify:
-                # Status anpassen wenn wieder verfügbar
-                if is_back_in_stock:
-                    status_text = "🎉 Wieder verfügbar!"
-                
-                # Produkttyp ermitteln
-                title_product_type = extract_product_type_from_text(title)
-                
-                # Produkt-Informationen für die Batch-Benachrichtigung
-                product_data = {
-                    "title": title,
-                    "url": product_url,
-                    "price": price,
-                    "status_text": status_text,
-                    "is_available": is_available,
-                    "matched_term": matched_term,
-                    "product_type": title_product_type,
-                    "shop": "sapphire-cards.de"
-                }
-                
-                new_matches.append(product_id)
-                logger.info(f"✅ Neuer Treffer bei sapphire-cards.de: {title} - {status_text}")
+            if register_product(product_data, seen, out_of_stock, only_available, new_matches):
+                logger.info(f"✅ Neuer Treffer bei sapphire-cards.de: {title} - {product_data['status_text']}")
                 
                 # Gib die Produktdaten zurück für die Batch-Benachrichtigung
                 return product_data
@@ -569,17 +975,308 @@ def process_product_url(product_url, keywords_map, seen, out_of_stock, only_avai
         logger.error(f"❌ Fehler beim Prüfen des Produkts {product_url}: {e}")
         return False
 
+def register_product(product_data, seen, out_of_stock, only_available, new_matches):
+    """
+    Aktualisiert den Produktstatus und entscheidet, ob das Produkt gemeldet wird
+    
+    :param product_data: Produktdaten als Dict (wird bei Wiederverfügbarkeit angepasst)
+    :param seen: Set mit bereits gemeldeten Produkten
+    :param out_of_stock: Set mit ausverkauften Produkten
+    :param only_available: Ob nur verfügbare Produkte gemeldet werden sollen
+    :param new_matches: Liste, an die die Produkt-ID eines neuen Treffers angehängt wird
+    :return: True wenn das Produkt gemeldet werden soll, sonst False
+    """
+    product_id = create_product_id(product_data["url"], product_data["title"])
+    should_notify, is_back_in_stock = update_product_status(
+        product_id, product_data["is_available"], seen, out_of_stock
+    )
+    
+    # Bei "nur verfügbare" Option überspringen, wenn nicht verfügbar
+    if only_available and not product_data["is_available"]:
+        return False
+    
+    if not should_notify:
+        return False
+    
+    # Status anpassen wenn wieder verfügbar
+    if is_back_in_stock:
+        product_data["status_text"] = "🎉 Wieder verfügbar!"
+    
+    new_matches.append(product_id)
+    return True
+
+def analyze_product_page(html_text, soup, product_url, title_product_type):
+    """
+    Ermittelt Verfügbarkeit und Preis aus einer vollständig geparsten Produktseite
+    
+    :param html_text: Dekodierter HTML-Text der Produktseite
+    :param soup: BeautifulSoup-Objekt der Produktseite
+    :param product_url: URL der Produktseite
+    :param title_product_type: Aus dem Titel erkannter Produkttyp (für den Standardpreis)
+    :return: Tuple (is_available, price, status_text) oder None, wenn es kein Pokemon-Produkt ist
+    """
+    # Vorprüfung: Ist es ein Pokemon-Produkt? (Seitentext nur einmal aufbauen und weiterverwenden)
+    page_text_raw = soup.get_text()
+    page_text = page_text_raw.lower()
+    if not ('pokemon' in page_text or 'pokémon' in page_text):
+        logger.debug("⚠️ Kein Pokemon-Produkt: %s", product_url)
+        return None
+    
+    # Verwende das Availability-Modul für Verfügbarkeitsprüfung - nur auf dem Kaufbereich, damit
+    # weniger Knoten durchsucht werden und Buttons verwandter Produkte nicht mitzählen
+    availability_region = select_availability_region(soup)
+    is_available, price, status_text = detect_availability(availability_region, product_url)
+    
+    availability_unclear = is_available is None or status_text == "[?] Status unbekannt"
+    
+    # Strukturierte Daten (JSON-LD/Microdata) sind eindeutiger als die Heuristik auf Seitenelementen
+    if availability_unclear:
+        schema_availability = extract_schema_availability(html_text, availability_region, product_url)
+        if schema_availability is not None:
+            is_available, status_text = schema_availability
+            availability_unclear = False
+    
+    price_missing = price == "Preis nicht verfügbar"
+    fallback_elements = find_fallback_elements(soup) if availability_unclear or price_missing else {}
+    
+    # Verbesserte Verfügbarkeitserkennung bei unklaren Ergebnissen
+    if availability_unclear:
+        # Indikatoren in absteigender Priorität prüfen, der erste eindeutige entscheidet:
+        # Status-Text "auf Lager" > Ausverkauft-Text > aktiver Warenkorb-Button
+        is_available, reason = False, None
+        stock_status = fallback_elements.get('stock')
+        stock_text = stock_status.text.strip() if stock_status else ""
+        add_to_cart = fallback_elements.get('cart')
+        
+        if stock_text and _RE_IN_STOCK_STATUS.search(stock_text):
+            is_available, reason = True, f"Status-Text: '{stock_text}'"
+        elif _RE_OOS.search(page_text):
+            reason = "Ausverkauft-Text gefunden"
+        elif add_to_cart and 'disabled' not in add_to_cart.attrs and 'disabled' not in add_to_cart.get('class', []):
+            is_available, reason = True, "Warenkorb-Button aktiv"
+        
+        # Setze endgültigen Status
+        status_text = f"[{'V' if is_available else 'X'}] {'Verfügbar' if is_available else 'Ausverkauft'}"
+        if reason:
+            status_text += f" ({reason})"
+    
+    # Preisextraktion verbessern
+    if price_missing:
+        price_elem = fallback_elements.get('price')
+        if price_elem:
+            price = price_elem.text.strip()
+        else:
+            # Nur im bereits aufgebauten Text des Produktbereichs suchen, nicht im Roh-HTML
+            # (dort stünde z.B. der Mini-Warenkorb im Header mit "0,00 €" vor dem Produktpreis)
+            price_match = _RE_PRICE.search(page_text_raw)
+            if price_match:
+                price = f"{price_match.group(1)}€"
+            else:
+                # Standardpreis basierend auf Produkttyp
+                price = STANDARD_PRICES.get(title_product_type, "Preis nicht verfügbar")
+    
+    return is_available, price, status_text
+
+def extract_schema_availability(html_text, region, product_url):
+    """
+    Liest den Lagerstatus aus schema.org-Angaben des Hauptprodukts (JSON-LD oder itemprop="availability")
+    
+    :param html_text: HTML-Text der Produktseite
+    :param region: Kaufbereich der Produktseite (für Microdata-Angaben)
+    :param product_url: URL der Produktseite (zur Auswahl des Produkts im JSON-LD)
+    :return: Tuple (is_available, status_text) oder None, wenn keine Angabe vorhanden ist
+    """
+    availabilities = []
+    product = find_main_schema_product(html_text, product_url)
+    if product is not None:
+        offers = product.get("offers") or []
+        for offer in offers if isinstance(offers, list) else [offers]:
+            if isinstance(offer, dict) and isinstance(offer.get("availability"), str):
+                availabilities.append(offer["availability"])
+    
+    # Microdata nur im Kaufbereich auswerten, nicht bei verwandten Produkten
+    if not availabilities:
+        elem = _SEL_SCHEMA_AVAILABILITY.select_one(region)
+        if elem is not None:
+            availabilities.append(elem.get("href") or elem.get("content") or "")
+    
+    matches = [match for match in (_RE_SCHEMA_AVAILABILITY.search(value.strip()) for value in availabilities) if match]
+    if not matches:
+        return None
+    
+    # Bei mehreren Angeboten (Varianten) genügt ein verfügbares
+    for match in matches:
+        if match.group(1).lower() in ("instock", "preorder", "backorder"):
+            return True, f"[V] Verfügbar (Schema.org: {match.group(1)})"
+    return False, f"[X] Ausverkauft (Schema.org: {matches[0].group(1)})"
+
+def find_main_schema_product(html_text, product_url):
+    """
+    Sucht in den JSON-LD-Blöcken das Product-Objekt der Seite
+    
+    :param html_text: HTML-Text der Produktseite
+    :param product_url: URL der Produktseite
+    :return: Product-Objekt mit passender URL, sonst das erste Product-Objekt oder None
+    """
+    products = []
+    for block in _RE_LD_JSON.findall(html_text):
+        try:
+            products.extend(iter_schema_products(json.loads(block)))
+        except ValueError:
+            continue
+    
+    page_url = product_url.split("#")[0].rstrip("/")
+    for product in products:
+        product_ref = product.get("url") or product.get("@id") or ""
+        if isinstance(product_ref, str) and product_ref.split("#")[0].rstrip("/") == page_url:
+            return product
+    return products[0] if products else None
+
+def iter_schema_products(data):
+    """
+    Liefert die Product-Objekte der obersten Ebene eines JSON-LD-Blocks (auch innerhalb von @graph)
+    
+    :param data: Geparster JSON-LD-Inhalt
+    :return: Generator über Product-Objekte
+    """
+    if isinstance(data, list):
+        for item in data:
+            yield from iter_schema_products(item)
+    elif isinstance(data, dict):
+        if "@graph" in data:
+            yield from iter_schema_products(data["@graph"])
+            return
+        types = data.get("@type")
+        if types == "Product" or (isinstance(types, list) and "Product" in types):
+            yield data
+
+def find_fallback_elements(soup):
+    """
+    Sucht Warenkorb-Button, Lagerstatus und Preis in einem einzigen Durchlauf über den Baum
+    
+    :param soup: BeautifulSoup-Objekt der Produktseite
+    :return: Dictionary mit den jeweils ersten Treffern für 'cart', 'stock' und 'price'
+    """
+    found = {}
+    for elem in _SEL_FALLBACK.select(soup):
+        for key, selector in (('cart', _SEL_CART), ('stock', _SEL_STOCK), ('price', _SEL_PRICE)):
+            if key not in found and selector.match(elem):
+                found[key] = elem
+        if len(found) == 3:
+            break
+    return found
+
+def select_availability_region(soup):
+    """
+    Liefert den kleinsten Teilbaum mit Preis, Lagerstatus und Warenkorb-Button
+    
+    :param soup: BeautifulSoup-Objekt der Produktseite
+    :return: Kaufbereich als Tag oder die ganze Seite, wenn er nicht gefunden wurde
+    """
+    summary = _SEL_PRODUCT_SUMMARY.select_one(soup)
+    if summary is not None and _SEL_CART.select_one(summary) is not None:
+        return summary
+    return soup
+
+def select_title_element(soup):
+    """
+    Sucht das Titelelement mit einem kombinierten Selektor und wählt nach der Priorität in _SEL_TITLES
+    
+    :param soup: BeautifulSoup-Objekt der Produktseite
+    :return: Titelelement oder None
+    """
+    candidates = _SEL_TITLE_ANY.select(soup)
+    if not candidates:
+        return None
+    
+    for selector in _SEL_TITLES:
+        for elem in candidates:
+            if selector.match(elem):
+                return elem
+    
+    # Generisches h1 als letzte Option
+    for elem in candidates:
+        if elem.name == 'h1':
+            return elem
+    return None
+
+def select_page_title(soup):
+    """
+    Liest den Seitentitel aus og:title oder, falls nicht vorhanden, aus dem title-Tag
+    
+    :param soup: BeautifulSoup-Objekt der Produktseite
+    :return: Titel oder None
+    """
+    candidates = _SEL_PAGE_TITLE.select(soup)
+    for elem in candidates:
+        if elem.name == 'meta':
+            return elem.get('content', '')
+    return candidates[0].text.strip() if candidates else None
+
+def trim_product_html(html_text):
+    """
+    Schneidet das HTML auf den Produktbereich zu (ohne Head, Footer und nachgeladene Skripte)
+    
+    :param html_text: HTML-Text der Produktseite
+    :return: Ausschnitt des Produktbereichs oder None, wenn die Marker fehlen
+    """
+    for marker in PRODUCT_REGION_START:
+        start = html_text.find(marker)
+        if start != -1:
+            end = html_text.find(PRODUCT_REGION_END, start)
+            return html_text[start:end] if end != -1 else html_text[start:]
+    return None
+
+def parse_product_region(response, html_text):
+    """
+    Parst nur den Produktbereich einer Seite und fällt auf das ganze Dokument zurück,
+    wenn der Ausschnitt fehlt oder keinen Hinweis auf ein Pokemon-Produkt enthält
+    
+    :param response: Response der Produktseite
+    :param html_text: Bereits dekodierter HTML-Text der Response
+    :return: BeautifulSoup-Objekt
+    """
+    region = trim_product_html(html_text)
+    if region:
+        region_lower = region.lower()
+        if 'pokemon' in region_lower or 'pokémon' in region_lower:
+            return BeautifulSoup(region, HTML_PARSER)
+    return BeautifulSoup(response.content, HTML_PARSER, from_encoding=response.encoding)
+
+def extract_title_fast(html_text):
+    """
+    Liest den Produkttitel inkrementell mit lxml und bricht beim ersten
+    Produkttitel-Element ab, sodass der Rest der Seite nicht geparst wird
+    
+    :param html_text: HTML-Inhalt der Produktseite
+    :return: Produkttitel oder None, wenn kein Titel-Element gefunden wurde
+    """
+    try:
+        for _, elem in etree.iterparse(BytesIO(html_text.encode("utf-8")), events=("end",), tag="h1",
+                                       html=True, recover=True, encoding="utf-8"):
+            classes = (elem.get("class") or "").split()
+            if any(css_class in classes for css_class in PRODUCT_TITLE_CLASSES):
+                title = "".join(elem.itertext()).strip()
+                if title:
+                    return title
+            elem.clear()
+    except (etree.LxmlError, ValueError) as e:
+        logger.debug("Schnelle Titelextraktion fehlgeschlagen: %s", e)
+    
+    return None
+
 def create_product_id(product_url, title):
     """Erzeugt eine eindeutige, stabile Produkt-ID"""
+    # Die ID wird in seen/out_of_stock gespeichert: Hash nicht ändern, sonst gelten alle Produkte als neu
     url_hash = hashlib.md5(product_url.encode()).hexdigest()[:10]
     
     # Extrahiere Produkttyp aus dem Titel
     product_type = extract_product_type_from_text(title)
     
     # Normalisiere Titel für einen Identifizierer (entferne produktspezifische Begriffe)
-    normalized_title = re.sub(r'\s+(display|box|tin|etb)$', '', title.lower())
-    normalized_title = re.sub(r'\s+', '-', normalized_title)
-    normalized_title = re.sub(r'[^a-z0-9\-]', '', normalized_title)
+    normalized_title = _RE_TYPE_SUFFIX.sub('', title.lower())
+    normalized_title = _RE_WHITESPACE.sub('-', normalized_title)
+    normalized_title = _RE_NON_ID_CHARS.sub('', normalized_title)
     
     return f"sapphirecards_{normalized_title}_{product_type}_{url_hash}"
 
@@ -599,8 +1296,8 @@ def create_fallback_product(search_term, product_type, product_name=None):
     # Normalisiere den Suchbegriff für die URL
     normalized_term = product_name or search_term.lower()
     # Entferne produktspezifische Begriffe wie "display", "box"
-    normalized_term = re.sub(r'\s+(display|box|tin|etb)$', '', normalized_term)
-    url_term = re.sub(r'\s+', '-', normalized_term)
+    normalized_term = _RE_TYPE_SUFFIX.sub('', normalized_term)
+    url_term = _RE_WHITESPACE.sub('-', normalized_term)
     
     # Bei sapphire-cards.de spezielle Formulierung verwenden
     if "reisegefährten" in normalized_term.lower():
@@ -630,20 +1327,11 @@ def create_fallback_product(search_term, product_type, product_name=None):
         "blister": f"https://sapphire-cards.de/produkt/{url_term}-booster/"
     }
     
-    # Preis basierend auf Produkttyp
-    price_map = {
-        "display": "159,99 €",
-        "etb": "49,99 €",
-        "box": "49,99 €",
-        "tin": "24,99 €",
-        "blister": "14,99 €"
-    }
-    
     # Erstelle Fallback-Produkt
     fallback_product = {
         "url": url_map.get(product_type),
         "title": title_map.get(product_type),
-        "price": price_map.get(product_type),
+        "price": STANDARD_PRICES.get(product_type),
         "is_available": True,
         "status_text": "✅ Verfügbar (Fallback)",
         "product_type": product_type,
@@ -661,6 +1349,8 @@ def generate_title_from_url(url):
     :return: Generierter Titel
     """
     try:
+        url_lower = url.lower()
+        
         # Extrahiere den letzten Pfadteil der URL (nach dem letzten Schrägstrich)
         path_parts = url.rstrip('/').split('/')
         last_part = path_parts[-1]
@@ -680,19 +1370,20 @@ def generate_title_from_url(url):
             title = title.replace("Reisegefaehrten", "Reisegefährten")
             
         # Bei sapphire-cards.de-URLs spezifisches Format
-        if "journey-together-reisegefaehrten" in url.lower():
+        if "journey-together-reisegefaehrten" in url_lower:
             title = title.replace("Journey Together Reisegefaehrten", "Journey Together | Reisegefährten")
         
         # Analysiere die URL-Struktur, um Produkttyp zu bestimmen
-        if any(term in url.lower() for term in ['booster-box', 'display']):
-            if 'display' not in title.lower() and 'box' not in title.lower():
+        title_lower = title.lower()
+        if any(term in url_lower for term in ['booster-box', 'display']):
+            if 'display' not in title_lower and 'box' not in title_lower:
                 title += ' Display'
-        elif any(term in url.lower() for term in ['elite-trainer', 'etb']):
-            if 'elite' not in title.lower() and 'trainer' not in title.lower():
+        elif any(term in url_lower for term in ['elite-trainer', 'etb']):
+            if 'elite' not in title_lower and 'trainer' not in title_lower:
                 title += ' Elite Trainer Box'
         
         # Stelle sicher, dass "Pokemon" im Titel vorkommt
-        if 'pokemon' not in title.lower():
+        if 'pokemon' not in title_lower:
             title = 'Pokemon ' + title
         
         return title
@@ -10,14 +10,15 @@ import logging
 import time
 import json
 import os
+from functools import lru_cache
 from pathlib import Path
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 from urllib.parse import urljoin
 from utils.telegram import send_batch_notification
 from utils.matcher import is_keyword_in_text, extract_product_type_from_text, load_exclusion_sets
 from utils.stock import get_status_text, update_product_status
 from utils.availability import detect_availability
-from utils.requests_handler import get_page_content, get_default_headers
+from utils.requests_handler import get_page_content, get_default_headers, HTML_PARSER
 
 # Logger konfigurieren
 logger = logging.getLogger(__name__)
@@ -25,6 +26,17 @@ logger = logging.getLogger(__name__)
 # Cache-Datei für gefundene Produkt-URLs
 PRODUCT_CACHE_FILE = "data/tcgviert_cache.json"
 
+# Einfache Produkttyp-Erkennung für IDs, falls der Matcher keinen Typ liefert (Reihenfolge = Priorität)
+_PRODUCT_TYPE_FALLBACKS = (
+    ("display", re.compile(r'display|36er')),
+    ("etb", re.compile(r'etb|elite trainer box')),
+    ("booster", re.compile(r'booster|pack')),
+)
+_RE_SERIES_CODE = re.compile(r'(?:sv|kp)(?:\s|-)?\d+')
+
+# Auf der Hauptseite werden nur Links ausgewertet, den restlichen Baum nicht aufbauen
+_STRAINER_LINKS = SoupStrainer("a", href=True)
+
 def load_product_cache():
     """Lädt den Cache mit gefundenen Produkt-URLs"""
     try:
@@ -52,6 +64,7 @@ def save_product_cache(cache_data):
         logger.error(f"⚠️ Fehler beim Speichern des Produkt-Caches: {e}")
         return False
 
+@lru_cache(maxsize=1024)  # Rein vom Titel abhängig, pro Durchlauf mehrfach für dieselben Produkte aufgerufen
 def extract_product_info(title):
     """
     Extrahiert wichtige Produktinformationen aus dem Titel für die ID-Erstellung
@@ -71,19 +84,16 @@ def extract_product_info(title):
     product_type = extract_product_type_from_text(title)
     if product_type == "unknown":
         # Fallback zur einfachen Methode
-        if re.search(r'display|36er', title.lower()):
-            product_type = "display"
-        elif re.search(r'etb|elite trainer box', title.lower()):
-            product_type = "etb"
-        elif re.search(r'booster|pack', title.lower()):
-            product_type = "booster"
-        else:
-            product_type = "unknown"
+        title_lower = title.lower()
+        product_type = next(
+            (fallback_type for fallback_type, pattern in _PRODUCT_TYPE_FALLBACKS if pattern.search(title_lower)),
+            "unknown"
+        )
     
     # Extrahiere Serien-/Set-Code
     series_code = "unknown"
     # Suche nach Standard-Codes wie SV09, KP09, etc.
-    code_match = re.search(r'(?:sv|kp)(?:\s|-)?\d+', title.lower())
+    code_match = _RE_SERIES_CODE.search(title.lower())
     if code_match:
         series_code = code_match.group(0).replace(" ", "").replace("-", "")
     
@@ -183,7 +193,8 @@ def check_cached_products(keywords_map, seen, out_of_stock, only_available=False
                 url,
                 headers=headers,
                 verify_ssl=True,
-                timeout=15
+                timeout=15,
+                parser=HTML_PARSER
             )
             
             if not success:
@@ -252,7 +263,7 @@ def discover_collection_urls():
     Entdeckt aktuelle Collection-URLs durch Scraping der Hauptseite
     """
     logger.info("🔍 Suche nach Collection-URLs auf der Hauptseite")
-    valid_urls = []
+    valid_urls = {}
     
     try:
         # Start mit wichtigsten URLs
@@ -272,7 +283,7 @@ def discover_collection_urls():
             logger.warning(f"⚠️ Fehler beim Abrufen der Hauptseite: Status {response.status_code}")
             return priority_urls
                 
-        soup = BeautifulSoup(response.text, "html.parser")
+        soup = BeautifulSoup(response.content, HTML_PARSER, parse_only=_STRAINER_LINKS)
         
         # Finde alle Links
         for link in soup.find_all("a", href=True):
@@ -283,19 +294,17 @@ def discover_collection_urls():
                 
                 # Priorisiere relevante URLs
                 if any(term in href.lower() for term in ["pokemon", "vorbestell"]):
-                    if full_url not in valid_urls:
-                        valid_urls.append(full_url)
+                    valid_urls[full_url] = None
         
         # Füge Haupt-Collection-URL immer hinzu (alle Produkte)
         all_products_url = f"{main_url}/collections/all"
-        if all_products_url not in valid_urls:
-            valid_urls.append(all_products_url)
+        valid_urls[all_products_url] = None
             
         # Wenn keine gültigen URLs gefunden wurden, verwende Priority-URLs
         if not valid_urls:
             return priority_urls
             
-        return valid_urls
+        return list(valid_urls)
         
     except Exception as e:
         logger.error(f"❌ Fehler bei der Collection-URL-Entdeckung: {e}")
@@ -491,7 +500,8 @@ def scrape_tcgviert_html(urls, keywords_map, seen, out_of_stock, only_available=
                 url,
                 headers=headers,
                 verify_ssl=True,
-                timeout=15
+                timeout=15,
+                parser=HTML_PARSER
             )
             
             if not success:
@@ -559,7 +569,8 @@ def scrape_tcgviert_html(urls, keywords_map, seen, out_of_stock, only_available=
                         product_url,
                         headers=headers,
                         verify_ssl=True,
-                        timeout=15
+                        timeout=15,
+                        parser=HTML_PARSER
                     )
                     
                     if not success:
@@ -699,7 +710,8 @@ def scrape_tcgviert_html(urls, keywords_map, seen, out_of_stock, only_available=
                             product_url,
                             headers=headers,
                             verify_ssl=True,
-                            timeout=15
+                            timeout=15,
+                            parser=HTML_PARSER
                         )
                         
                         if not success:
@@ -8,11 +8,64 @@ Indikatoren und Muster, die hier implementiert werden.
 
 import re
 import logging
+from functools import lru_cache
+import soupsieve as sv
 from bs4 import BeautifulSoup
 
 # Logger konfigurieren
 logger = logging.getLogger(__name__)
 
+# Feste Textmuster der Shop-Prüfungen (einmal kompiliert, pro Textknoten über soup.find angewendet)
+_RE_SAPPHIRE_CART_TEXT = re.compile("In den Warenkorb", re.IGNORECASE)
+_RE_SAPPHIRE_OOS_TEXT = re.compile("(ausverkauft|nicht verfügbar|out of stock)", re.IGNORECASE)
+_RE_COMICPLANET_UNAVAILABLE = re.compile("Nicht mehr verfügbar", re.IGNORECASE)
+_RE_TCGVIERT_SOLD_OUT = re.compile("AUSVERKAUFT", re.IGNORECASE)
+_RE_CARD_CORNER_AVAILABLE = re.compile("(Verfügbar|Auf Lager|Sofort lieferbar)", re.IGNORECASE)
+_RE_CARD_CORNER_UNAVAILABLE = re.compile("(Momentan nicht verfügbar|Ausverkauft|Artikel ist leider nicht)", re.IGNORECASE)
+_RE_MIGHTY_PREORDER = re.compile("Vorbestellung|Pre-Order|Preorder", re.IGNORECASE)
+_RE_MIGHTY_SOLD_OUT = re.compile("Ausverkauft", re.IGNORECASE)
+_RE_GAMES_ISLAND_UNAVAILABLE = re.compile("Momentan nicht verfügbar", re.IGNORECASE)
+_RE_GAMES_ISLAND_IN_STOCK = re.compile("AUF LAGER", re.IGNORECASE)
+_RE_GAMES_ISLAND_AVAILABLE = re.compile("Sofort verfügbar", re.IGNORECASE)
+_RE_GAMEWARE_CART_TEXT = re.compile("IN DEN WARENKORB", re.IGNORECASE)
+_RE_GAMEWARE_UNAVAILABLE = re.compile("Bestellung momentan nicht möglich", re.IGNORECASE)
+
+# Bei jedem Produkt verwendete Muster (Domain, Preis) nur einmal kompilieren
+_RE_DOMAIN = re.compile(r'https?://(?:www\.)?([^/]+)')
+_RE_WHITESPACE = re.compile(r'\s+')
+_RE_PRICE_PATTERNS = (
+    re.compile(r'(\d+[,.]\d+)\s*[€$£]'),  # 19,99 € oder 19.99 €
+    re.compile(r'[€$£]\s*(\d+[,.]\d+)'),  # € 19,99 oder € 19.99
+    re.compile(r'(\d+[,.]\d+)'),          # Nur Zahl als letzter Versuch
+)
+
+# Muster der generischen Prüfung (Reihenfolge bestimmt den gemeldeten Treffer)
+_RE_PREORDER = re.compile(r'vorbestellung|pre-?order')
+GENERIC_UNAVAILABLE_PATTERNS = (
+    'ausverkauft', 'sold out', 'out of stock', 'nicht verfügbar',
+    'nicht auf lager', 'vergriffen', 'derzeit nicht verfügbar',
+    'momentan nicht', 'benachrichtigen'
+)
+GENERIC_AVAILABLE_PATTERNS = ('auf lager', 'verfügbar', 'available', 'in stock', 'lieferbar')
+
+DEFAULT_PRICE_SELECTORS = (
+    '.price', '.product-price', '.woocommerce-Price-amount', 
+    '[itemprop="price"]', '.product__price', '.price-item',
+    '.current-price', '.product-single__price', '.product-price-box',
+    '.main-price', '.price-box', '.offer-price', '.price-regular',
+    '.details-product-price__value'  # Speziell für mighty-cards.de
+)
+
+@lru_cache(maxsize=32)
+def _compile_selectors(selectors):
+    """
+    Kompiliert eine Selektorliste einmalig: kombinierter Selektor plus Einzelselektoren für die Priorität
+    
+    :param selectors: Tupel von CSS-Selektoren in Prioritätsreihenfolge
+    :return: (kombinierter Selektor, Liste der Einzelselektoren)
+    """
+    return sv.compile(', '.join(selectors)), [sv.compile(selector) for selector in selectors]
+
 def detect_availability(soup, url):
     """
     Erkennt die Verfügbarkeit eines Produkts basierend auf der Website-URL
@@ -46,7 +99,7 @@ def detect_availability(soup, url):
 
 def extract_domain(url):
     """Extrahiert die Domain aus einer URL"""
-    match = re.search(r'https?://(?:www\.)?([^/]+)', url)
+    match = _RE_DOMAIN.search(url)
     return match.group(1) if match else url
 
 def extract_price(soup, selectors=None):
@@ -59,33 +112,24 @@ def extract_price(soup, selectors=None):
     """
     # Standardselektoren, falls keine spezifischen angegeben sind
     if selectors is None:
-        selectors = [
-            '.price', '.product-price', '.woocommerce-Price-amount', 
-            '[itemprop="price"]', '.product__price', '.price-item',
-            '.current-price', '.product-single__price', '.product-price-box',
-            '.main-price', '.price-box', '.offer-price', '.price-regular',
-            '.details-product-price__value'  # Speziell für mighty-cards.de
-        ]
-    
-    # Versuche, Preis mit verschiedenen Selektoren zu finden
-    for selector in selectors:
-        price_elem = soup.select_one(selector)
+        selectors = DEFAULT_PRICE_SELECTORS
+    
+    # Ein Durchlauf mit dem kombinierten Selektor statt eines select_one pro Selektor;
+    # danach wie bisher nach Selektor-Priorität das erste passende Element wählen
+    combined, prioritized = _compile_selectors(tuple(selectors))
+    candidates = combined.select(soup)
+    for selector in prioritized:
+        price_elem = next((elem for elem in candidates if selector.match(elem)), None)
         if price_elem:
             price_text = price_elem.get_text().strip()
             # Bereinige Preis
-            price_text = re.sub(r'\s+', ' ', price_text)
+            price_text = _RE_WHITESPACE.sub(' ', price_text)
             return price_text
     
     # Wenn kein strukturiertes Element gefunden wurde, versuche Regex
     page_text = soup.get_text()
-    price_patterns = [
-        r'(\d+[,.]\d+)\s*[€$£]',  # 19,99 € oder 19.99 €
-        r'[€$£]\s*(\d+[,.]\d+)',  # € 19,99 oder € 19.99
-        r'(\d+[,.]\d+)',          # Nur Zahl als letzter Versuch
-    ]
-    
-    for pattern in price_patterns:
-        match = re.search(pattern, page_text)
+    for pattern in _RE_PRICE_PATTERNS:
+        match = pattern.search(page_text)
         if match:
             return f"{match.group(1)}€"
     
@@ -106,8 +150,7 @@ def check_comicplanet(soup):
     price = extract_price(soup, ['.price', '.product-price'])
     
     # Prüfe auf "Nicht mehr verfügbar"-Text
-    unavailable_text = soup.find(string=re.compile("Nicht mehr verfügbar", re.IGNORECASE))
-    if unavailable_text:
+    if soup.find(string=_RE_COMICPLANET_UNAVAILABLE):
         return False, price, "[X] Ausverkauft (Nicht mehr verfügbar)"
     
     # Prüfe auf Benachrichtigungselement
@@ -126,7 +169,7 @@ def check_comicplanet(soup):
         return False, price, "[X] Ausverkauft (Nur Details-Button)"
     
     # Wenn keine der bekannten Muster zutrifft, generische Methode
-    is_available, _, status_text = check_generic(soup)
+    is_available, _, status_text = check_generic(soup, price)
     return is_available, price, status_text
 
 def check_kofuku(soup):
@@ -222,8 +265,7 @@ def check_tcgviert(soup):
     price = extract_price(soup, ['.price', '.product-price', '.product__price'])
     
     # Prüfe auf "AUSVERKAUFT"-Text auf der Seite
-    sold_out_text = soup.find(string=re.compile("AUSVERKAUFT", re.IGNORECASE))
-    if sold_out_text:
+    if soup.find(string=_RE_TCGVIERT_SOLD_OUT):
         return False, price, "[X] Ausverkauft (AUSVERKAUFT-Text gefunden)"
     
     # Prüfe auf Benachrichtigungsbutton
@@ -247,7 +289,7 @@ def check_tcgviert(soup):
         return True, price, "[V] Verfügbar (Add-to-Cart Button)"
     
     # Wenn keine der bekannten Muster zutrifft, generische Methode
-    is_available, _, status_text = check_generic(soup)
+    is_available, _, status_text = check_generic(soup, price)
     return is_available, price, status_text
 
 def check_card_corner(soup):
@@ -265,11 +307,9 @@ def check_card_corner(soup):
     """
     # Extrahiere den Preis
     price = extract_price(soup, ['.price', '.product-price', '.product__price'])
-    page_text = soup.get_text().lower()
     
     # 1. Prüfe auf Verfügbar-Text
-    available_text = soup.find(string=re.compile("(Verfügbar|Auf Lager|Sofort lieferbar)", re.IGNORECASE))
-    if available_text:
+    if soup.find(string=_RE_CARD_CORNER_AVAILABLE):
         return True, price, "[V] Verfügbar (Verfügbar-Text)"
     
     # 2. Prüfe auf aktiven Warenkorb-Button
@@ -278,8 +318,7 @@ def check_card_corner(soup):
         return True, price, "[V] Verfügbar (Warenkorb-Button aktiv)"
     
     # 3. Prüfe auf "Momentan nicht verfügbar" oder "Ausverkauft" Text
-    unavailable_text = soup.find(string=re.compile("(Momentan nicht verfügbar|Ausverkauft|Artikel ist leider nicht)", re.IGNORECASE))
-    if unavailable_text:
+    if soup.find(string=_RE_CARD_CORNER_UNAVAILABLE):
         return False, price, "[X] Ausverkauft (Text gefunden)"
     
     # 4. Prüfe auf ausverkauft Badge oder Element
@@ -293,7 +332,7 @@ def check_card_corner(soup):
         return False, price, "[X] Ausverkauft (Button deaktiviert)"
     
     # Wenn nichts eindeutiges gefunden wurde, prüfe generisch
-    is_available, _, status_text = check_generic(soup)
+    is_available, _, status_text = check_generic(soup, price)
     return is_available, price, status_text
 
 def check_sapphire_cards(soup):
@@ -326,13 +365,13 @@ def check_sapphire_cards(soup):
         return True, price, "[V] Verfügbar (Aktive Sprachauswahl)"
     
     # Prüfe auf "In den Warenkorb"-Text (als zusätzlichen Indikator)
-    cart_text = soup.find(string=re.compile("In den Warenkorb", re.IGNORECASE))
+    cart_text = soup.find(string=_RE_SAPPHIRE_CART_TEXT)
     if cart_text and not red_cart_button:
         # Wenn wir Warenkorb-Text haben, aber keinen roten Button, ist es wahrscheinlich verfügbar
         return True, price, "[V] Verfügbar (Warenkorb-Text)"
     
     # Prüfe auf ausverkauft-Text
-    if soup.find(string=re.compile("(ausverkauft|nicht verfügbar|out of stock)", re.IGNORECASE)):
+    if soup.find(string=_RE_SAPPHIRE_OOS_TEXT):
         return False, price, "[X] Ausverkauft (Text gefunden)"
     
     # Prüfe auf Benachrichtigungsoptionen
@@ -341,7 +380,7 @@ def check_sapphire_cards(soup):
         return False, price, "[X] Ausverkauft (Benachrichtigungsfunktion)"
     
     # Wenn keine der bekannten Muster zutrifft, generische Methode
-    is_available, _, status_text = check_generic(soup)
+    is_available, _, status_text = check_generic(soup, price)
     return is_available, price, status_text
 
 def check_mighty_cards(soup):
@@ -360,9 +399,7 @@ def check_mighty_cards(soup):
     price = extract_price(soup, ['.details-product-price__value', '.product-details__product-price', '.price'])
     
     # Prüfe auf Vorbestellung (Preorder)
-    is_preorder = False
-    if soup.find(string=re.compile("Vorbestellung|Pre-Order|Preorder", re.IGNORECASE)):
-        is_preorder = True
+    is_preorder = soup.find(string=_RE_MIGHTY_PREORDER) is not None
     
     # 1. HTML-basierte Verfügbarkeitsprüfung (basierend auf der Website-Analyse)
     # Suche nach dem "In den Warenkorb"-Button
@@ -389,8 +426,7 @@ def check_mighty_cards(soup):
             return True, price, "[V] Verfügbar (Warenkorb-Text gefunden)"
     
     # 3. Prüfe auf "Ausverkauft"-Text
-    sold_out_text = soup.find(string=re.compile("Ausverkauft", re.IGNORECASE))
-    if sold_out_text:
+    if soup.find(string=_RE_MIGHTY_SOLD_OUT):
         return False, price, "[X] Ausverkauft (Text gefunden)"
     
     # 4. Prüfe auf "NEW"-Badge (meist nur bei verfügbaren Produkten)
@@ -415,7 +451,7 @@ def check_mighty_cards(soup):
             pass
     
     # 6. Fallback: Generische Methode
-    is_available, _, status_text = check_generic(soup)
+    is_available, _, status_text = check_generic(soup, price)
     return is_available, price, status_text
 
 def check_games_island(soup):
@@ -435,8 +471,7 @@ def check_games_island(soup):
     price = extract_price(soup, ['.price', '.product-price', '.current-price'])
     
     # Prüfe auf "Momentan nicht verfügbar"-Text
-    unavailable_text = soup.find(string=re.compile("Momentan nicht verfügbar", re.IGNORECASE))
-    if unavailable_text:
+    if soup.find(string=_RE_GAMES_ISLAND_UNAVAILABLE):
         return False, price, "[X] Ausverkauft (Momentan nicht verfügbar)"
     
     # Prüfe auf "Benachrichtigung anfordern"-Button
@@ -445,13 +480,11 @@ def check_games_island(soup):
         return False, price, "[X] Ausverkauft (Benachrichtigungsbutton)"
     
     # Prüfe auf "AUF LAGER"-Status
-    in_stock_badge = soup.find(string=re.compile("AUF LAGER", re.IGNORECASE))
-    if in_stock_badge:
+    if soup.find(string=_RE_GAMES_ISLAND_IN_STOCK):
         return True, price, "[V] Verfügbar (AUF LAGER-Badge)"
     
     # Prüfe auf "Sofort verfügbar"-Text
-    available_text = soup.find(string=re.compile("Sofort verfügbar", re.IGNORECASE))
-    if available_text:
+    if soup.find(string=_RE_GAMES_ISLAND_AVAILABLE):
         return True, price, "[V] Verfügbar (Sofort verfügbar)"
     
     # Prüfe auf "In den Warenkorb"-Button
@@ -460,7 +493,7 @@ def check_games_island(soup):
         return True, price, "[V] Verfügbar (Warenkorb-Button)"
     
     # Wenn keine der bekannten Muster zutrifft, generische Methode
-    is_available, _, status_text = check_generic(soup)
+    is_available, _, status_text = check_generic(soup, price)
     return is_available, price, status_text
 
 def check_gameware(soup):
@@ -500,13 +533,11 @@ def check_gameware(soup):
         return True, price, "[V] Verfügbar (Warenkorb-Button aktiv)"
     
     # 4. Explizite Prüfung auf "IN DEN WARENKORB"-Text im Button
-    cart_text_button = soup.find(string=re.compile("IN DEN WARENKORB", re.IGNORECASE))
-    if cart_text_button and not soup.select_one('button.disabled, [disabled]'):
+    if soup.find(string=_RE_GAMEWARE_CART_TEXT) and not soup.select_one('button.disabled, [disabled]'):
         return True, price, "[V] Verfügbar (Warenkorb-Text vorhanden)"
     
     # 5. Prüfe auf "Bestellung momentan nicht möglich"-Text
-    unavailable_text = soup.find(string=re.compile("Bestellung momentan nicht möglich", re.IGNORECASE))
-    if unavailable_text:
+    if soup.find(string=_RE_GAMEWARE_UNAVAILABLE):
         return False, price, "[X] Ausverkauft (Bestellung nicht möglich)"
     
     # 6. Prüfe auf orangefarbenen/roten Status-Indikator
@@ -523,53 +554,54 @@ def check_gameware(soup):
         return False, price, "[X] Ausverkauft (Nicht verfügbar)"
     
     # Generische Methode als Fallback
-    is_available, _, status_text = check_generic(soup)
+    is_available, _, status_text = check_generic(soup, price, page_text)
     return is_available, price, status_text
 
-def check_generic(soup):
+def is_disabled_or_sold_out_button(button):
+    """
+    Prüft, ob ein Kauf-Button deaktiviert ist oder "ausverkauft" anzeigt
+    
+    :param button: Button- oder Input-Element
+    :return: True wenn der Button nicht zum Kauf führt
+    """
+    button_text = button.get_text().lower()
+    return 'disabled' in str(button) or 'ausverkauft' in button_text or 'sold out' in button_text
+
+def check_generic(soup, price=None, page_text=None):
     """
     Generische Methode zur Verfügbarkeitsprüfung, die auf verschiedenen Websites funktioniert
     
     Diese Methode verwendet allgemeine Muster, die auf vielen E-Commerce-Seiten zu finden sind.
+    
+    :param soup: BeautifulSoup-Objekt der Produktseite
+    :param price: Bereits ermittelter Preis (optional, sonst wird er extrahiert)
+    :param page_text: Bereits aufgebauter Seitentext in Kleinbuchstaben (optional)
+    :return: Tuple (is_available, price, status_text)
     """
-    page_text = soup.get_text().lower()
+    if page_text is None:
+        page_text = soup.get_text().lower()
     
     # Extrahiere den Preis
-    price = extract_price(soup)
-    
-    # Prüfe auf Vorbestellung (Preorder)
-    is_preorder = False
-    if re.search(r'vorbestellung|pre-?order', page_text):
-        is_preorder = True
+    if price is None:
+        price = extract_price(soup)
     
     # Prüfe auf eindeutige Nichtverfügbarkeits-Signale
-    unavailable_patterns = [
-        'ausverkauft', 'sold out', 'out of stock', 'nicht verfügbar', 
-        'nicht auf lager', 'vergriffen', 'derzeit nicht verfügbar',
-        'momentan nicht', 'benachrichtigen'
-    ]
-    
-    for pattern in unavailable_patterns:
+    for pattern in GENERIC_UNAVAILABLE_PATTERNS:
         if pattern in page_text:
             return False, price, f"[X] Ausverkauft (Muster: '{pattern}')"
     
     # Suche nach Add-to-Cart / Buy-Buttons als positives Signal
     available_buttons = soup.select('button[type="submit"], input[type="submit"], .add-to-cart, .buy-now, #AddToCart, .product-form__cart-submit')
     has_add_button = len(available_buttons) > 0 and not any(
-        'disabled' in str(btn) or 'ausverkauft' in btn.get_text().lower() or 'sold out' in btn.get_text().lower()
-        for btn in available_buttons
+        is_disabled_or_sold_out_button(btn) for btn in available_buttons
     )
     
-    # Prüfe auf Verfügbarkeitshinweise
-    available_patterns = ['auf lager', 'verfügbar', 'available', 'in stock', 'lieferbar']
-    has_available_text = any(pattern in page_text for pattern in available_patterns)
-    
-    # Entscheidungslogik
-    if has_add_button and not any(pattern in page_text for pattern in unavailable_patterns):
+    # Entscheidungslogik (kein Nichtverfügbarkeits-Muster mehr möglich, siehe oben)
+    if has_add_button:
         return True, price, "[V] Verfügbar (Warenkorb-Button vorhanden)"
-    elif is_preorder:
+    elif _RE_PREORDER.search(page_text):
         return True, price, "[V] Vorbestellbar"
-    elif has_available_text:
+    elif any(pattern in page_text for pattern in GENERIC_AVAILABLE_PATTERNS):
         return True, price, "[V] Verfügbar (Verfügbarkeitstext)"
     else:
         # Bei Unsicherheit eher als "nicht verfügbar" behandeln
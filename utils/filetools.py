@@ -1,10 +1,15 @@
+import logging
+
+# Logger konfigurieren
+logger = logging.getLogger(__name__)
+
 def load_list(path):
     """Lädt eine Textdatei als Liste von Zeilen"""
     try:
         with open(path, "r", encoding="utf-8") as f:
             return [line.strip() for line in f if line.strip()]
     except FileNotFoundError:
-        print(f"⚠️ Warnung: Datei {path} nicht gefunden. Leere Liste wird zurückgegeben.", flush=True)
+        logger.warning("⚠️ Warnung: Datei %s nicht gefunden. Leere Liste wird zurückgegeben.", path)
         return []
 
 def load_seen(path="data/seen.txt"):
@@ -13,7 +18,7 @@ def load_seen(path="data/seen.txt"):
         with open(path, "r", encoding="utf-8") as f:
             return set(line.strip() for line in f if line.strip())
     except FileNotFoundError:
-        print(f"ℹ️ Hinweis: Datei {path} nicht gefunden. Neues Set wird erstellt.", flush=True)
+        logger.info("ℹ️ Hinweis: Datei %s nicht gefunden. Neues Set wird erstellt.", path)
         return set()
 
 def save_seen(seen, path="data/seen.txt"):
@@ -1,17 +1,99 @@
 import re
 import json
 import logging
+from functools import lru_cache
 
 # Logger konfigurieren
 logger = logging.getLogger(__name__)
 
+# Klare Muster für verschiedene Produkttypen (Reihenfolge = Priorität)
+PRODUCT_TYPE_PATTERNS = {
+    "display": [
+        r'\bdisplay\b', 
+        r'\b36er\b', 
+        r'\b36\s+booster\b', 
+        r'\bbooster\s+display\b', 
+        r'\bbox\s+display\b',
+        r'\b36\s+(?:pack|packs)\b',
+        r'\bbooster\s+box\b',
+        r'\b18er\s+booster\s+display\b',
+        r'\b36er\s+display\b'
+    ],
+    "etb": [
+        r'\belite\s+trainer\s+box\b', 
+        r'\betb\b', 
+        r'\belite-trainer-box\b',
+        r'\belitetrainerbox\b'
+    ],
+    "ttb": [
+        r'\btop\s+trainer\s+box\b',
+        r'\bttb\b',
+        r'\btop-trainer-box\b',
+        r'\btoptrainerbox\b'
+    ],
+    "build_battle": [
+        r'\bbuild\s*[&]?\s*battle\b', 
+        r'\bprerelease\b'
+    ],
+    "blister": [
+        r'\bblister\b', 
+        r'\b3er\s+booster\b',
+        r'\b3\s*er\b',
+        r'\b3-pack\b', 
+        r'\bchecklane\b', 
+        r'\bsleeve(?:d)?\s+booster\b',
+        r'\b3\s*pack\b',
+        r'\bpremium\s*checklane\b'
+    ],
+    "single_booster": [
+        r'\bsingle\s+booster\b', 
+        r'\bbooster\s+pack\b'
+    ],
+    "tin": [
+        r'\btin\b', 
+        r'\bmetal\s+box\b'
+    ],
+    "premium": [
+        r'\bpremium\b', 
+        r'\bcollection\b', 
+        r'\bcollector\b'
+    ]
+}
+
+# Alle Produkttyp-Muster als eine Alternation mit benannten Gruppen. Die Lookaheads
+# prüfen jede Position genau einmal; pro Position meldet die Gruppe mit der
+# höchsten Priorität, sodass ein einziger Durchlauf den besten Typ liefert.
+_RE_PRODUCT_TYPE = re.compile("|".join(
+    f"(?=(?P<{product_type}>{'|'.join(patterns)}))"
+    for product_type, patterns in PRODUCT_TYPE_PATTERNS.items()
+))
+_PRODUCT_TYPE_PRIORITY = {product_type: index for index, product_type in enumerate(PRODUCT_TYPE_PATTERNS)}
+
+# Vorkompilierte Muster für die Vor- und Nachprüfungen in extract_product_type_from_text
+_RE_DISPLAY_WORD = re.compile(r'\bdisplay\b')
+_RE_DISPLAY_COUNT = re.compile(r'\b36\b|\b36er\b|\b18\b|\b18er\b')
+_RE_BOOSTER_BOX = re.compile(r'\bbooster\s+box\b')
+_RE_SET_CODE = re.compile(r'\b(sv\d+|kp\d+)\b')
+_RE_SET_CODE_DISPLAY = re.compile(r'\b36er\b|\b18er\b|\bdisplay\b|\bbooster box\b')
+_RE_BOOSTER_PACK = re.compile(r'\bbooster\s+pack\b|\bpack\b|\beinzelpack\b|\bsingle\s*pack\b')
+_RE_BLISTER = re.compile(r'\b3er\b|\b3-pack\b|\b3\s+pack\b|\bblister\b|\b3\s*er\b|\bchecklane\b')
+_RE_DISPLAY_BOOSTER_COUNT = re.compile(r'\b36er\b|\b36\s+booster\b|\b18er\b|\b18\s+booster\b')
+_RE_PRICE_HINT = re.compile(r'\b\d[,\.]\d{2}\s*[€$]')
+_RE_PRICE_VALUE = re.compile(r'(\d+[,\.]\d{2})\s*[€$]')
+_RE_BOOSTER_WORD = re.compile(r'\bbooster\b')
+_RE_DISPLAY_OR_BOX = re.compile(r'display|36er|box')
+_RE_DISPLAY_MULTIPLIER = re.compile(r'36\s*(x|\*)')
+_RE_BOOSTER_BOX_LOOSE = re.compile(r'booster\s*box', re.IGNORECASE)
+_RE_CLEAN_CHARS = re.compile(r"[^a-zA-Z0-9äöüß ]")
+_RE_MULTI_SPACE = re.compile(r"\s+")
+
 def clean_text(text):
     """
     Entfernt Sonderzeichen, wandelt zu Kleinbuchstaben & entfernt doppelte Leerzeichen
     """
     text = str(text).lower()
-    text = re.sub(r"[^a-zA-Z0-9äöüß ]", " ", text)
-    text = re.sub(r"\s+", " ", text)  # Mehrere Leerzeichen zu einem reduzieren
+    text = _RE_CLEAN_CHARS.sub(" ", text)
+    text = _RE_MULTI_SPACE.sub(" ", text)  # Mehrere Leerzeichen zu einem reduzieren
     return text.strip()
 
 def extract_product_type_from_text(text):
@@ -23,129 +105,88 @@ def extract_product_type_from_text(text):
     """
     if not text:
         return "unknown"
-        
-    text = text.lower()
-    
-    # Definiere klare Muster für verschiedene Produkttypen
-    product_patterns = {
-        "display": [
-            r'\bdisplay\b', 
-            r'\b36er\b', 
-            r'\b36\s+booster\b', 
-            r'\bbooster\s+display\b', 
-            r'\bbox\s+display\b',
-            r'\b36\s+(pack|packs)\b',
-            r'\bbooster\s+box\b',
-            r'\b18er\s+booster\s+display\b',
-            r'\b36er\s+display\b'
-        ],
-        "etb": [
-            r'\belite\s+trainer\s+box\b', 
-            r'\betb\b', 
-            r'\belite-trainer-box\b',
-            r'\belitetrainerbox\b'
-        ],
-        "ttb": [
-            r'\btop\s+trainer\s+box\b',
-            r'\bttb\b',
-            r'\btop-trainer-box\b',
-            r'\btoptrainerbox\b'
-        ],
-        "build_battle": [
-            r'\bbuild\s*[&]?\s*battle\b', 
-            r'\bprerelease\b'
-        ],
-        "blister": [
-            r'\bblister\b', 
-            r'\b3er\s+booster\b',
-            r'\b3\s*er\b',
-            r'\b3-pack\b', 
-            r'\bchecklane\b', 
-            r'\bsleeve(d)?\s+booster\b',
-            r'\b3\s*pack\b',
-            r'\bpremium\s*checklane\b'
-        ],
-        "single_booster": [
-            r'\bsingle\s+booster\b', 
-            r'\bbooster\s+pack\b'
-        ],
-        "tin": [
-            r'\btin\b', 
-            r'\bmetal\s+box\b'
-        ],
-        "premium": [
-            r'\bpremium\b', 
-            r'\bcollection\b', 
-            r'\bcollector\b'
-        ]
-    }
     
+    # Cache auf dem kleingeschriebenen Text, damit Schreibvarianten denselben Eintrag treffen
+    return _extract_product_type_cached(text.lower())
+
+# Ergebnis hängt nur vom Text ab; Suchbegriffe und Titel werden pro Durchlauf mehrfach klassifiziert
+@lru_cache(maxsize=2048)
+def _extract_product_type_cached(text):
+    """
+    Klassifiziert einen bereits kleingeschriebenen Text (siehe extract_product_type_from_text)
+    
+    :param text: Text in Kleinbuchstaben
+    :return: Produkttyp als String oder "unknown" wenn nicht eindeutig
+    """
     # Stark hervorheben: Wenn "display" und "36" oder "18" im Text vorkommen, ist es definitiv ein Display 
-    # - höchste Priorität, wird immer zuerst geprüft
-    if (re.search(r'\bdisplay\b', text) and 
-        (re.search(r'\b36\b|\b36er\b|\b18\b|\b18er\b', text) or re.search(r'\bbooster\s+box\b', text))):
+    # - höchste Priorität, wird immer zuerst geprüft (Teilstring-Test vor der Regex, da deutlich günstiger)
+    if ('display' in text and _RE_DISPLAY_WORD.search(text) and 
+        (_RE_DISPLAY_COUNT.search(text) or _RE_BOOSTER_BOX.search(text))):
         return "display"
         
     # Spezifische Codes-Muster, die üblicherweise mit bestimmten Produkttypen verbunden sind
     # SVXX/KPXX + (36er/18er oder Display)
-    if (re.search(r'\b(sv\d+|kp\d+)\b', text) and 
-        (re.search(r'\b36er\b|\b18er\b|\bdisplay\b|\bbooster box\b', text))):
+    if (('sv' in text or 'kp' in text) and _RE_SET_CODE.search(text) and 
+        (_RE_SET_CODE_DISPLAY.search(text))):
         return "display"
         
     # Explizit nach "booster pack" oder "pack" suchen, um single booster von displays zu unterscheiden
-    has_booster_pack_pattern = r'\bbooster\s+pack\b|\bpack\b|\beinzelpack\b|\bsingle\s*pack\b'
-    has_booster_pack = re.search(has_booster_pack_pattern, text) is not None
+    has_booster_pack = 'pack' in text and _RE_BOOSTER_PACK.search(text) is not None
     
     # Explizit nach "3er", "3-pack", etc. suchen, um blister zu identifizieren
-    blister_pattern = r'\b3er\b|\b3-pack\b|\b3\s+pack\b|\bblister\b|\b3\s*er\b|\bchecklane\b'
-    has_3pack_or_blister = re.search(blister_pattern, text) is not None
-    
-    # Jedes Muster prüfen und den ersten Treffer zurückgeben
-    for product_type, patterns in product_patterns.items():
-        for pattern in patterns:
-            if re.search(pattern, text):
-                # Vermeidung von Fehlklassifikationen:
-                
-                # Wenn wir "display" gefunden haben, prüfen wir ob auch "3er"/"blister" vorhanden ist
-                if product_type == "display" and has_3pack_or_blister:
-                    # In diesem Fall handelt es sich wahrscheinlich um ein Blister-Produkt
-                    logger.debug(f"Produkt enthält 'display', aber auch blister/3er: '{text}' → als blister klassifiziert")
-                    return "blister"
-                
-                # Wenn wir "display" gefunden haben und einzelne Booster-Muster definitiv im Titel stehen, 
-                # dann ist es kein Display, sondern einzelne Booster
-                if product_type == "display" and has_booster_pack:
-                    # Check für spezielle Display-Kennzeichen, die stärker sind als Booster-Pack
-                    if re.search(r'\b36er\b|\b36\s+booster\b|\b18er\b|\b18\s+booster\b', text):
-                        # Bei expliziter Anzahl von Boostern (36/18) ist es ein Display trotz "Pack" im Namen
-                        return "display"
-                    logger.debug(f"Produkt enthält 'display', aber auch 'booster pack': '{text}' → als single_booster klassifiziert")
-                    return "single_booster"
-                
-                # Wenn "booster" und "Preis unter 10€" gefunden wird, ist es sehr wahrscheinlich ein einzelner Booster
-                if product_type == "display" and re.search(r'\b\d[,\.]\d{2}\s*[€$]', text):
-                    # Extrahiere Preis und prüfe, ob er unter 10€ liegt
-                    price_match = re.search(r'(\d+[,\.]\d{2})\s*[€$]', text)
-                    if price_match:
-                        price_str = price_match.group(1).replace(',', '.')
-                        try:
-                            price = float(price_str)
-                            if price < 10.0:
-                                logger.debug(f"Produkt enthält 'display', aber Preis unter 10€ ({price}€): '{text}' → als single_booster klassifiziert")
-                                return "single_booster"
-                        except ValueError:
-                            pass
-                
-                return product_type
+    has_3pack_or_blister = ('3' in text or 'blister' in text or 'checklane' in text) and _RE_BLISTER.search(text) is not None
+    
+    # Alle Muster in einem Durchlauf prüfen und den Typ mit der höchsten Priorität wählen
+    product_type = None
+    for match in _RE_PRODUCT_TYPE.finditer(text):
+        if product_type is None or _PRODUCT_TYPE_PRIORITY[match.lastgroup] < _PRODUCT_TYPE_PRIORITY[product_type]:
+            product_type = match.lastgroup
+            if _PRODUCT_TYPE_PRIORITY[product_type] == 0:
+                break
+    
+    if product_type:
+        # Vermeidung von Fehlklassifikationen:
+        
+        # Wenn wir "display" gefunden haben, prüfen wir ob auch "3er"/"blister" vorhanden ist
+        if product_type == "display" and has_3pack_or_blister:
+            # In diesem Fall handelt es sich wahrscheinlich um ein Blister-Produkt
+            logger.debug(f"Produkt enthält 'display', aber auch blister/3er: '{text}' → als blister klassifiziert")
+            return "blister"
+        
+        # Wenn wir "display" gefunden haben und einzelne Booster-Muster definitiv im Titel stehen, 
+        # dann ist es kein Display, sondern einzelne Booster
+        if product_type == "display" and has_booster_pack:
+            # Check für spezielle Display-Kennzeichen, die stärker sind als Booster-Pack
+            if _RE_DISPLAY_BOOSTER_COUNT.search(text):
+                # Bei expliziter Anzahl von Boostern (36/18) ist es ein Display trotz "Pack" im Namen
+                return "display"
+            logger.debug(f"Produkt enthält 'display', aber auch 'booster pack': '{text}' → als single_booster klassifiziert")
+            return "single_booster"
+        
+        # Wenn "booster" und "Preis unter 10€" gefunden wird, ist es sehr wahrscheinlich ein einzelner Booster
+        if product_type == "display" and _RE_PRICE_HINT.search(text):
+            # Extrahiere Preis und prüfe, ob er unter 10€ liegt
+            price_match = _RE_PRICE_VALUE.search(text)
+            if price_match:
+                price_str = price_match.group(1).replace(',', '.')
+                try:
+                    price = float(price_str)
+                    if price < 10.0:
+                        logger.debug(f"Produkt enthält 'display', aber Preis unter 10€ ({price}€): '{text}' → als single_booster klassifiziert")
+                        return "single_booster"
+                except ValueError:
+                    pass
+        
+        return product_type
     
     # Spezialfall für einzelne Booster erkennen (ohne "display" im Text)
-    if has_booster_pack or (re.search(r'\bbooster\b', text) and not re.search(r'display|36er|box', text)):
+    if has_booster_pack or ('booster' in text and _RE_BOOSTER_WORD.search(text) and not _RE_DISPLAY_OR_BOX.search(text)):
         # Wenn "Booster" alleine steht, ohne "display" oder "36er", dann ist es ein einzelner Booster
         return "single_booster"
     
     # Wenn wir hier sind, haben wir keinen eindeutigen Produkttyp erkannt
     # Nochmal spezifische Muster für Display-Produkte prüfen
-    if re.search(r'36\s*(x|\*)', text) or re.search(r'booster\s*box', text, re.IGNORECASE):
+    if _RE_DISPLAY_MULTIPLIER.search(text) or _RE_BOOSTER_BOX_LOOSE.search(text):
         return "display"
         
     return "unknown"  # Default: Wenn kein klarer Produkttyp erkannt wurde
@@ -187,13 +228,12 @@ def is_keyword_in_text(keywords, text, log_level='DEBUG'):
     if not text or len(text) < 3:
         return False
         
-    original_keywords = " ".join(keywords)  # für Debug-Ausgaben
     original_text = text  # Originaltext für Debug-Ausgaben speichern
     text = clean_text(text)
     
-    # Extrahiere den Produkttyp aus dem Suchbegriff
-    search_term = " ".join(keywords)
-    search_product_type = extract_product_type_from_text(search_term)
+    # Alles, was nur vom Suchbegriff abhängt, einmal pro Suchbegriff vorbereiten
+    search_term, search_product_type, product_keywords, important_keywords = _prepare_keyword_info(tuple(keywords))
+    original_keywords = search_term  # für Debug-Ausgaben
     
     # Extrahiere den Produkttyp aus dem zu durchsuchenden Text
     text_product_type = extract_product_type_from_text(text)
@@ -209,52 +249,20 @@ def is_keyword_in_text(keywords, text, log_level='DEBUG'):
     # Versuche, eine Konfigurationsdatei mit Ausschlusssets zu laden
     exclusion_sets = load_exclusion_sets()
     
-    # Produktspezifische Keywords aus dem Suchbegriff extrahieren (ohne Produkttyp)
-    product_keywords = extract_product_keywords(search_term)
-    
     # Prüfe, ob Text Ausschlusssets enthält, die nicht dem gesuchten Produkt entsprechen
+    # (clean_text liefert bereits Kleinbuchstaben)
     for exclusion in exclusion_sets:
-        if exclusion in text.lower() and not any(keyword in exclusion for keyword in product_keywords):
+        if exclusion in text and not any(keyword in exclusion for keyword in product_keywords):
             if log_level and log_level != 'None':
                 logger.debug(f"⚠️ Text enthält ausgeschlossenes Set '{exclusion}': '{original_text}'")
             return False
     
-    # Standardisiere Singular/Plural
-    standardized_keywords = []
-    for word in keywords:
-        if word in ["display", "displays"]:
-            standardized_keywords.append("display")
-        elif word in ["booster", "boosters"]:
-            standardized_keywords.append("booster")
-        elif word in ["pack", "packs"]:
-            standardized_keywords.append("pack")
-        elif word in ["box", "boxes"]:
-            standardized_keywords.append("box")
-        else:
-            standardized_keywords.append(word)
-    
-    # Standardisiere auch im Text
+    # Standardisiere Singular/Plural im Text
     standardized_text = text
     for singular, plural in [("display", "displays"), ("booster", "boosters"), 
                             ("pack", "packs"), ("box", "boxes")]:
         standardized_text = standardized_text.replace(plural, singular)
     
-    # Überprüfe die Übereinstimmung von Schlüsselwörtern
-    # Ignoriere kurze Wörter (< 3 Zeichen) und häufige Füllwörter
-    ignore_words = ["und", "the", "and", "for", "mit", "von", "pro", "per", "der", "die", "das"]
-    
-    # Wichtige Schlüsselwörter identifizieren, die unterscheiden zwischen Displays und anderen Produkten
-    important_keywords = []
-    
-    # Sammle wichtige Keywords (> 3 Zeichen) und nicht in ignore_words,
-    # aber nicht die Produkttyp-Wörter (die werden separat geprüft)
-    important_keywords = [k for k in standardized_keywords 
-                         if len(k) > 3 and k not in ignore_words and k not in ["display", "booster", "pack", "box", "etb", "ttb", "blister"]]
-    
-    # Wenn es keine wichtigen Keywords gibt, verwende alle
-    if not important_keywords:
-        important_keywords = [k for k in standardized_keywords if k not in ignore_words]
-    
     # Zähle, wie viele wichtige Keywords gefunden wurden
     found_count = sum(1 for key_term in important_keywords if key_term in standardized_text)
     
@@ -290,6 +298,49 @@ def is_keyword_in_text(keywords, text, log_level='DEBUG'):
         
     return True
 
+@lru_cache(maxsize=256)
+def _prepare_keyword_info(keywords):
+    """
+    Bereitet die vom Suchbegriff abhängigen Daten für is_keyword_in_text vor
+    
+    :param keywords: Tuple mit einzelnen Wörtern des Suchbegriffs
+    :return: Tuple (search_term, search_product_type, product_keywords, important_keywords)
+    """
+    search_term = " ".join(keywords)
+    search_product_type = extract_product_type_from_text(search_term)
+    
+    # Produktspezifische Keywords aus dem Suchbegriff extrahieren (ohne Produkttyp)
+    product_keywords = tuple(extract_product_keywords(search_term))
+    
+    # Standardisiere Singular/Plural
+    standardized_keywords = []
+    for word in keywords:
+        if word in ["display", "displays"]:
+            standardized_keywords.append("display")
+        elif word in ["booster", "boosters"]:
+            standardized_keywords.append("booster")
+        elif word in ["pack", "packs"]:
+            standardized_keywords.append("pack")
+        elif word in ["box", "boxes"]:
+            standardized_keywords.append("box")
+        else:
+            standardized_keywords.append(word)
+    
+    # Überprüfe die Übereinstimmung von Schlüsselwörtern
+    # Ignoriere kurze Wörter (< 3 Zeichen) und häufige Füllwörter
+    ignore_words = ["und", "the", "and", "for", "mit", "von", "pro", "per", "der", "die", "das"]
+    
+    # Sammle wichtige Keywords (> 3 Zeichen) und nicht in ignore_words,
+    # aber nicht die Produkttyp-Wörter (die werden separat geprüft)
+    important_keywords = [k for k in standardized_keywords 
+                         if len(k) > 3 and k not in ignore_words and k not in ["display", "booster", "pack", "box", "etb", "ttb", "blister"]]
+    
+    # Wenn es keine wichtigen Keywords gibt, verwende alle
+    if not important_keywords:
+        important_keywords = [k for k in standardized_keywords if k not in ignore_words]
+    
+    return search_term, search_product_type, product_keywords, tuple(important_keywords)
+
 def extract_product_keywords(search_term):
     """
     Extrahiert produktspezifische Keywords aus einem Suchbegriff (ohne Produkttyp)
@@ -28,6 +28,7 @@ logger = logging.getLogger(__name__)
 DEFAULT_TIMEOUT = 15  # Sekunden
 MAX_RETRIES = 3
 BACKOFF_FACTOR = 1.5
+HTML_PARSER = "lxml"  # C-basierter Parser, deutlich schneller als html.parser
 
 # Liste problematischer Domains, die SSL-Fehler verursachen und mit verify=False behandelt werden sollten
 SSL_PROBLEMATIC_DOMAINS = [
@@ -531,11 +532,11 @@ def parse_html(html_content, parser="html.parser"):
     """
     Parsed HTML-Inhalt zu einem BeautifulSoup-Objekt
     
-    :param html_content: HTML-Inhalt als String oder Response-Objekt
+    :param html_content: HTML-Inhalt als Bytes, String oder Response-Objekt
     :param parser: HTML-Parser (Standard: html.parser, Alternative: lxml)
     :return: BeautifulSoup-Objekt
     """
-    from bs4 import BeautifulSoup
+    from bs4 import BeautifulSoup, FeatureNotFound
     
     # Wenn html_content ein Response-Objekt ist, extrahiere den Text
     if hasattr(html_content, 'text'):
@@ -546,7 +547,7 @@ def parse_html(html_content, parser="html.parser"):
         if parser == "lxml":
             try:
                 return BeautifulSoup(html_content, "lxml")
-            except ImportError:
+            except (FeatureNotFound, ImportError):
                 logger.warning("lxml-Parser nicht verfügbar, verwende html.parser")
                 return BeautifulSoup(html_content, "html.parser")
         else:
@@ -1,11 +1,31 @@
 import requests
 import json
 import re
+import time
+import queue
+import atexit
 import logging
+import threading
+from functools import lru_cache
 
 # Logger konfigurieren
 logger = logging.getLogger(__name__)
 
+# Hintergrund-Versand: Nachrichten werden gepuffert und von einem Worker-Thread gesendet.
+# Reihenfolge: Eingereihte Nachrichten gehen in Einreihungsreihenfolge (FIFO) raus, sind aber
+# NICHT mit direkten send_telegram_message-Aufrufen (z.B. anderer Scraper) synchronisiert.
+# Wer eine feste Reihenfolge braucht, ruft vorher flush_notifications() auf.
+# Zustellung: best effort - ein Fehlschlag wird einmal wiederholt und danach nur protokolliert.
+NOTIFY_QUEUE_SIZE = 256
+NOTIFY_RETRY_DELAY = 5  # Sekunden bis zum erneuten Versuch nach einem Fehler
+NOTIFY_FLUSH_TIMEOUT = 30  # Maximale Wartezeit von flush_notifications in Sekunden
+NOTIFY_EXIT_FLUSH_TIMEOUT = 10  # Maximale Wartezeit beim Beenden des Programms in Sekunden
+TELEGRAM_MAX_LENGTH = 4096  # Maximale Länge einer Telegram-Nachricht
+
+_notify_queue = queue.Queue(maxsize=NOTIFY_QUEUE_SIZE)
+_notify_thread = None
+_notify_thread_lock = threading.Lock()
+
 def load_telegram_config(path="config/telegram_config.json"):
     """Lädt die Telegram-Konfiguration"""
     try:
@@ -15,6 +35,7 @@ def load_telegram_config(path="config/telegram_config.json"):
         logger.error(f"❌ Fehler beim Laden der Telegram-Konfiguration: {e}")
         return {"bot_token": "", "chat_id": ""}
 
+@lru_cache(maxsize=512)  # Titel, Preise und Shopnamen wiederholen sich von Durchlauf zu Durchlauf
 def escape_markdown(text):
     """
     Escapes Markdown special characters in a string.
@@ -87,6 +108,117 @@ def send_telegram_message(text, retry_without_markdown=True):
         logger.error(f"❌ Telegram-Fehler: {e}")
         return False
 
+def _notification_worker():
+    """Sendet gepufferte Nachrichten nacheinander und versucht fehlgeschlagene einmal erneut"""
+    while True:
+        text = _notify_queue.get()
+        try:
+            if not send_telegram_message(text):
+                time.sleep(NOTIFY_RETRY_DELAY)
+                if not send_telegram_message(text):
+                    logger.error("❌ Telegram-Nachricht konnte auch im zweiten Versuch nicht gesendet werden")
+        except Exception as e:
+            logger.error(f"❌ Fehler im Telegram-Worker: {e}")
+        finally:
+            _notify_queue.task_done()
+
+def _ensure_notification_worker():
+    """Startet den Worker-Thread für den Hintergrund-Versand, falls noch nicht geschehen"""
+    global _notify_thread
+    with _notify_thread_lock:
+        if _notify_thread is None or not _notify_thread.is_alive():
+            _notify_thread = threading.Thread(target=_notification_worker, name="telegram-notify", daemon=True)
+            _notify_thread.start()
+
+def queue_telegram_message(text):
+    """
+    Stellt eine Nachricht in die Warteschlange, ohne auf den Telegram-Request zu warten
+    
+    Die Nachricht wird nach allen zuvor eingereihten gesendet, aber ohne Reihenfolge gegenüber
+    direkten send_telegram_message-Aufrufen. Ein späterer Versandfehler wird nur protokolliert.
+    
+    :param text: Der zu sendende Text (mit Markdown-Formatierung)
+    :return: True wenn eingereiht (oder bei voller Warteschlange direkt gesendet), sonst False
+    """
+    _ensure_notification_worker()
+    try:
+        _notify_queue.put_nowait(text)
+        return True
+    except queue.Full:
+        logger.warning("⚠️ Telegram-Warteschlange voll, sende Nachricht direkt")
+        return send_telegram_message(text)
+
+def flush_notifications(timeout=NOTIFY_FLUSH_TIMEOUT):
+    """
+    Wartet, bis alle gepufferten Nachrichten gesendet wurden
+    
+    :param timeout: Maximale Wartezeit in Sekunden
+    :return: True wenn die Warteschlange leer ist, False bei Zeitüberschreitung
+    """
+    deadline = time.time() + timeout
+    with _notify_queue.all_tasks_done:
+        while _notify_queue.unfinished_tasks:
+            # Ohne laufenden Worker leert sich die Warteschlange nicht mehr
+            if _notify_thread is None or not _notify_thread.is_alive():
+                logger.warning(f"⚠️ {_notify_queue.unfinished_tasks} Telegram-Nachrichten wurden nicht mehr gesendet (kein Worker)")
+                return False
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                logger.warning(f"⚠️ {_notify_queue.unfinished_tasks} Telegram-Nachrichten wurden nicht mehr gesendet")
+                return False
+            _notify_queue.all_tasks_done.wait(remaining)
+    return True
+
+# Beim Beenden noch ausstehende Nachrichten senden, aber höchstens NOTIFY_EXIT_FLUSH_TIMEOUT Sekunden warten
+atexit.register(flush_notifications, NOTIFY_EXIT_FLUSH_TIMEOUT)
+
+def split_message_parts(message_parts, max_length=TELEGRAM_MAX_LENGTH):
+    """
+    Fasst Nachrichtenzeilen zu möglichst wenigen Nachrichten innerhalb des Telegram-Limits zusammen
+    
+    :param message_parts: Liste von Nachrichtenzeilen
+    :param max_length: Maximale Länge einer einzelnen Nachricht
+    :return: Liste von Nachrichtentexten
+    """
+    messages = []
+    current = []
+    current_length = 0
+    for part in (piece for message_part in message_parts for piece in split_long_part(message_part, max_length)):
+        # +1 für den Zeilenumbruch beim Zusammenfügen
+        part_length = len(part) + (1 if current else 0)
+        if current and current_length + part_length > max_length:
+            messages.append("\n".join(current))
+            current = []
+            current_length = 0
+            part_length = len(part)
+        current.append(part)
+        current_length += part_length
+    if current:
+        messages.append("\n".join(current))
+    return messages
+
+def split_long_part(part, max_length=TELEGRAM_MAX_LENGTH):
+    """
+    Teilt eine einzelne Nachrichtenzeile, die selbst länger als das Telegram-Limit ist
+    
+    :param part: Nachrichtenzeile
+    :param max_length: Maximale Länge einer einzelnen Nachricht
+    :return: Liste von Teilstücken, jedes höchstens max_length Zeichen lang
+    """
+    pieces = []
+    while len(part) > max_length:
+        # Bevorzugt an einem Zeilenumbruch trennen, sonst hart am Limit
+        cut = part.rfind("\n", 0, max_length)
+        if cut <= 0:
+            cut = max_length
+            # Markdown-Escape (Backslash + Zeichen) nicht auseinanderreißen
+            if part[cut - 1] == "\\":
+                cut -= 1
+        pieces.append(part[:cut])
+        part = part[cut:].lstrip("\n")
+    pieces.append(part)
+    return pieces
+
 def sort_products_by_availability(products):
     """
     Sortiert Produkte nach Verfügbarkeit (verfügbar, dann nicht verfügbar)
@@ -133,11 +265,12 @@ def send_product_notification(product):
     
     return send_telegram_message(msg)
 
-def send_batch_notification(products):
+def send_batch_notification(products, background=False):
     """
     Sendet eine Batch-Benachrichtigung für mehrere Produkte, sortiert nach Verfügbarkeit
     
     :param products: Liste von Produktdicts
+    :param background: Nachricht über den Worker-Thread senden, statt auf Telegram zu warten
     :return: True bei Erfolg, False bei Fehler
     """
     if not products:
@@ -184,6 +317,9 @@ def send_batch_notification(products):
             
             message_parts.append(f"{idx}\\. [{safe_title}]({url}) \\({safe_shop}\\)")
     
-    # Nachricht senden
-    message = "\n".join(message_parts)
-    return send_telegram_message(message)
\ No newline at end of file
+    # Nachricht senden - bei vielen Produkten auf mehrere Nachrichten innerhalb des Limits verteilen
+    send = queue_telegram_message if background else send_telegram_message
+    success = True
+    for message in split_message_parts(message_parts):
+        success = send(message) and success
+    return success
\ No newline at end of file